@@ -0,0 +1,60 @@
+"""
+Backfill review index - 기존 문서에 next_review_at 채우기
+
+ReviewIndex는 next_review_at이 있는 문서만 포함하는 sparse 인덱스이므로,
+next_review_at을 쓰기 시작하기 전에 만들어진 문서(복습 미완료)는 생성일로 채워줍니다.
+
+    python -m src.backfill_review_index            # 채우기
+    python -m src.backfill_review_index --dry-run  # 대상 문서 수만 출력
+"""
+import argparse
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from src.domains.subjects.repository import DocumentRepository
+
+
+def backfill(dry_run: bool = False) -> int:
+    """next_review_at을 채운 (dry-run이면 채울) 문서 수 반환"""
+    table = DocumentRepository().table
+    scan_kwargs = {
+        'FilterExpression': (
+            Attr('entity_type').eq('DOCUMENT')
+            & Attr('next_review_at').not_exists()
+            & Attr('review_completed').ne(True)
+        ),
+        'ProjectionExpression': 'PK, SK, created_at',
+    }
+    updated = 0
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if not dry_run:
+                try:
+                    table.update_item(
+                        Key={'PK': item['PK'], 'SK': item['SK']},
+                        UpdateExpression='SET next_review_at = created_at',
+                        # 스캔 이후 앱에서 이미 채웠으면 덮어쓰지 않음
+                        ConditionExpression='attribute_not_exists(next_review_at) AND attribute_exists(PK)',
+                    )
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                    continue
+            updated += 1
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return updated
+        scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기존 문서에 next_review_at 채우기")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 대상 문서 수만 출력")
+    args = parser.parse_args()
+
+    count = backfill(dry_run=args.dry_run)
+    print(f"✅ 완료: 문서 {count}개{' (dry-run)' if args.dry_run else ''}")
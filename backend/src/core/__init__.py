@@ -1,12 +1,17 @@
 """Core module"""
+from importlib import import_module
+
 from .config import settings
-from .database import Base, get_db
-from .security import (
-    create_access_token,
-    decode_access_token,
-    get_password_hash,
-    verify_password,
-)
+
+# database (SQLAlchemy) and security (passlib/bcrypt) are heavy; import them on first access
+_LAZY_EXPORTS = {
+    "Base": ".database",
+    "get_db": ".database",
+    "create_access_token": ".security",
+    "decode_access_token": ".security",
+    "get_password_hash": ".security",
+    "verify_password": ".security",
+}
 
 __all__ = [
     "settings",
@@ -17,3 +22,12 @@ __all__ = [
     "get_password_hash",
     "verify_password",
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,95 @@
+"""
+AWS client registry - process-wide boto3 clients shared across requests
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from .config import settings
+
+
+class AWSClientRegistry:
+    """Lazily created, reused boto3 clients keyed by (service, region)
+
+    boto3 clients are thread-safe once created, so a single client (and its
+    urllib3 connection pool) serves every request in the process, including
+    warm Lambda invocations. Creation itself is not thread-safe, so it is
+    done under a lock on a dedicated session.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+        self._session: Optional[boto3.session.Session] = None
+
+    def client(self, service_name: str, region_name: Optional[str] = None) -> Any:
+        """Return the shared client for a service, creating it on first use"""
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if self._session is None:
+                    self._session = boto3.session.Session()
+                client = self._session.client(
+                    service_name,
+                    region_name=region_name,
+                    config=self._config_for(service_name),
+                )
+                self._clients[key] = client
+            return client
+
+    def clear(self) -> None:
+        """Drop all cached clients (e.g. after credentials change)"""
+        with self._lock:
+            self._clients.clear()
+            self._session = None
+
+    @staticmethod
+    def _config_for(service_name: str) -> Config:
+        # Model invocations stream for a long time; everything else should fail fast
+        read_timeout = settings.AWS_READ_TIMEOUT
+        max_attempts = settings.AWS_MAX_ATTEMPTS
+        if service_name.startswith('bedrock'):
+            read_timeout = settings.BEDROCK_READ_TIMEOUT
+        elif service_name == 'cognito-idp':
+            # Login path: retries must fit inside COGNITO_CALL_TIMEOUT
+            read_timeout = settings.COGNITO_READ_TIMEOUT
+            max_attempts = settings.COGNITO_MAX_ATTEMPTS
+        return Config(
+            # Presigned S3 URLs/POST policies must be SigV4 (required outside legacy regions)
+            signature_version='s3v4' if service_name == 's3' else None,
+            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+            read_timeout=read_timeout,
+            retries={'mode': settings.AWS_RETRY_MODE, 'max_attempts': max_attempts},
+            tcp_keepalive=True,
+        )
+
+
+aws_clients = AWSClientRegistry()
+
+
+def get_aws_clients() -> AWSClientRegistry:
+    """Get the process-wide client registry"""
+    return aws_clients
+
+
+def get_s3_client() -> Any:
+    """Get shared S3 client"""
+    return aws_clients.client('s3')
+
+
+def get_bedrock_client() -> Any:
+    """Get shared Bedrock runtime client"""
+    return aws_clients.client('bedrock-runtime', region_name=settings.BEDROCK_REGION)
+
+
+def get_cognito_client() -> Any:
+    """Get shared Cognito identity provider client"""
+    return aws_clients.client('cognito-idp', region_name=settings.AWS_REGION)
@@ -23,6 +23,12 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     VERSION: str = "1.0.0"
 
+    # Cold start (see core/lazy_routers.py, src/import_budget.py)
+    LAZY_ROUTERS: bool = True  # mount domain routers on first request under their prefix
+    IMPORT_BUDGET_MS: int = 1500  # `python -m src.import_budget` fails above this
+    WARMUP_ON_INIT: bool = False  # always warm at init (provisioned concurrency/SnapStart warm automatically)
+    WARMUP_STEP_TIMEOUT: float = 5.0  # per async warmup step (JWKS fetch, DB connect)
+
     # DynamoDB Tables (using environment variables from serverless.yml)
     SUBJECTS_TABLE: Optional[str] = None
     DOCUMENTS_TABLE: Optional[str] = None
@@ -37,14 +43,84 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Cognito JWKS / token verification (see core/jwks.py)
+    JWKS_TTL_SECONDS: int = 60 * 60  # refresh keys in the background after this
+    JWKS_FETCH_TIMEOUT: float = 3.0
+    JWKS_MIN_REFETCH_SECONDS: float = 30.0  # at most one unknown-kid refetch per interval
+    VERIFIED_TOKEN_CACHE_SIZE: int = 2048
+    VERIFIED_TOKEN_CACHE_TTL: int = 300  # capped by the token's own exp
+
     # AWS Bedrock
     AWS_REGION: str = "us-east-1"
     BEDROCK_MODEL_ID: str = "anthropic.claude-3-sonnet-20240229-v1:0"
+    BEDROCK_REGION: str = "us-east-1"
+
+    # AWS clients (shared per process, see core/aws.py)
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_CONNECT_TIMEOUT: float = 3.0
+    AWS_READ_TIMEOUT: float = 10.0
+    BEDROCK_READ_TIMEOUT: float = 120.0
+    AWS_RETRY_MODE: str = "standard"
+    AWS_MAX_ATTEMPTS: int = 4
+
+    # DynamoDB (see core/dynamodb.py)
+    DYNAMODB_ENDPOINT_URL: Optional[str] = None  # e.g. http://localhost:8000 for DynamoDB Local
+    DYNAMODB_REGION: Optional[str] = None  # defaults to APP_AWS_REGION, then AWS_REGION
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = 50  # also the repository thread pool size
+    DYNAMODB_CONNECT_TIMEOUT: float = 3.0
+    DYNAMODB_READ_TIMEOUT: float = 10.0
+    DYNAMODB_MAX_ATTEMPTS: int = 6
+
+    # Cognito calls (see domains/auth/cognito.py)
+    COGNITO_MAX_CONCURRENCY: int = 16  # worker threads; further calls queue
+    COGNITO_CALL_TIMEOUT: float = 10.0  # queueing + all botocore attempts
+    COGNITO_READ_TIMEOUT: float = 5.0
+    COGNITO_MAX_ATTEMPTS: int = 3
+
+    # AI correction cache (see domains/subjects/correction_cache.py)
+    AI_CACHE_TABLE: Optional[str] = None  # DynamoDB table with TTL on expires_at
+    AI_CACHE_SQLITE_PATH: Optional[str] = "./ai_cache.db"  # local fallback when no table is set
+    AI_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7  # 7 days
+    AI_CACHE_MAX_ENTRIES: int = 256
+
+    # AI streaming (see core/streaming.py)
+    STREAM_BRIDGE_MAX_THREADS: int = 32  # concurrent blocking streams (one thread each)
+    AI_STREAM_BUFFER_CHUNKS: int = 64  # producer blocks when the client falls this far behind
+    AI_STREAM_COALESCE_CHARS: int = 0  # flush merged chunks at this size (0 = off)
+    AI_STREAM_COALESCE_MS: int = 0  # or this long after the first buffered chunk (0 = off)
+
+    # Long OCR texts are split on page/heading boundaries and processed in parallel
+    AI_CHUNK_MAX_CHARS: int = 6000  # per-chunk input size; shorter texts use a single call
+    AI_CHUNK_CONCURRENCY: int = 4  # chunk calls in flight per request
+
+    # Background jobs (ARQ worker: src/worker.py, jobs: domains/subjects/jobs.py)
+    REDIS_URL: Optional[str] = None  # job endpoints return 503 when unset
+    JOB_MAX_TRIES: int = 4
+    JOB_RETRY_BASE_SECONDS: float = 5.0  # retry delay doubles per attempt
+    JOB_TIMEOUT_SECONDS: int = 900
+    JOB_RESULT_TTL_SECONDS: int = 60 * 60  # results, progress events and idempotency window
+    JOB_EVENTS_MAX_SECONDS: float = 25.0  # per SSE connection; clients resume with Last-Event-ID
+
+    # Outbound LLM limits (see core/llm_limiter.py), shared by Bedrock and OpenAI
+    LLM_DEFAULT_MAX_CONCURRENCY: int = 8
+    LLM_DEFAULT_TOKENS_PER_MINUTE: int = 200_000
+    LLM_MODEL_LIMITS: dict[str, dict[str, int]] = {}  # per model id: max_concurrency, tokens_per_minute
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 20.0
+    LLM_CHARS_PER_TOKEN: float = 2.0  # conservative for Korean text
+    LLM_BACKOFF_BASE_SECONDS: float = 1.0
+    LLM_BACKOFF_MAX_SECONDS: float = 30.0
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4o-mini"
 
+    # AI tutor conversation memory (older turns are compacted into a rolling summary)
+    TUTOR_PROMPT_TOKEN_BUDGET: int = 3000  # hard cap for system + summary + history + new message
+    TUTOR_COMPACT_TRIGGER_TOKENS: int = 2000  # compact once unsummarized history exceeds this
+    TUTOR_RECENT_MESSAGES: int = 4  # raw turns kept verbatim after compaction
+    TUTOR_SUMMARY_MAX_TOKENS: int = 400
+    TUTOR_HISTORY_FETCH_LIMIT: int = 40  # max unsummarized turns loaded per request
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8000"]
 
@@ -52,6 +128,10 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Spaced repetition (SM-2)
+    REVIEW_INTERVAL_MODIFIER: float = 1.0
+    REVIEW_MAX_INTERVAL_DAYS: int = 365
+
 
 @lru_cache
 def get_settings() -> Settings:
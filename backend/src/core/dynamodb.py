@@ -0,0 +1,95 @@
+"""
+DynamoDB connection provider - lazily created boto3 resources, one per thread
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import boto3
+from botocore.config import Config
+
+from .config import settings
+
+
+class DynamoDBProvider:
+    """Lazily created DynamoDB resources and Table objects
+
+    Unlike clients, boto3 resources (and the Table objects they create) are not
+    thread-safe, and repositories run on a thread pool. Each thread therefore gets
+    its own resource, built on first use from one shared session (session creation
+    is not thread-safe, so it happens under a lock). Nothing is created at import
+    time, so cold starts only pay for DynamoDB on the first request that needs it.
+
+    endpoint_url points every resource at a DynamoDB stand-in (DynamoDB Local,
+    LocalStack) for tests and benchmarks.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_pool_connections: Optional[int] = None,
+    ):
+        self.endpoint_url = endpoint_url
+        self.region_name = region_name
+        self.max_pool_connections = max_pool_connections
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._session: Optional[boto3.session.Session] = None
+        self._generation = 0
+
+    def resource(self) -> Any:
+        """This thread's DynamoDB service resource, created on first use"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            with self._lock:
+                if self._session is None:
+                    self._session = boto3.session.Session()
+                local.resource = self._session.resource(
+                    'dynamodb',
+                    region_name=self._region(),
+                    endpoint_url=self.endpoint_url or settings.DYNAMODB_ENDPOINT_URL,
+                    config=self._config(),
+                )
+                local.tables = {}
+                local.generation = self._generation
+        return local.resource
+
+    def table(self, name: str) -> Any:
+        """This thread's Table object for `name`"""
+        resource = self.resource()
+        tables: Dict[str, Any] = self._local.tables
+        table = tables.get(name)
+        if table is None:
+            table = tables[name] = resource.Table(name)
+        return table
+
+    def clear(self) -> None:
+        """Drop every thread's resource (e.g. after changing the endpoint or credentials)"""
+        with self._lock:
+            self._session = None
+            self._generation += 1
+
+    def _region(self) -> str:
+        return (
+            self.region_name
+            or settings.DYNAMODB_REGION
+            or os.getenv('APP_AWS_REGION', settings.AWS_REGION)
+        )
+
+    def _config(self) -> Config:
+        return Config(
+            max_pool_connections=self.max_pool_connections or settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.DYNAMODB_CONNECT_TIMEOUT,
+            read_timeout=settings.DYNAMODB_READ_TIMEOUT,
+            retries={'mode': settings.AWS_RETRY_MODE, 'max_attempts': settings.DYNAMODB_MAX_ATTEMPTS},
+            tcp_keepalive=True,
+        )
+
+
+dynamodb_provider = DynamoDBProvider()
+
+
+def get_dynamodb() -> DynamoDBProvider:
+    """Get the process-wide DynamoDB provider"""
+    return dynamodb_provider
@@ -0,0 +1,152 @@
+"""
+JWKS manager and token verifier for RS256 tokens (Cognito)
+
+- Keys are fetched asynchronously with a timeout and parsed into key objects once.
+- After JWKS_TTL_SECONDS the keys are refreshed in the background while the current
+  ones keep serving (stale-while-revalidate; no timers, so it also works on Lambda).
+- An unknown `kid` (key rotation) triggers one shared refetch for all concurrent
+  callers. Every fetch, including the first and TTL refreshes, starts at most once per
+  JWKS_MIN_REFETCH_SECONDS, so junk tokens or a Cognito outage can't hammer the endpoint.
+- Verified tokens are remembered by SHA-256 for a short time, so repeated requests
+  with the same token skip signature verification.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from .config import settings
+
+
+class JWKSManager:
+    """Cached, refreshed JSON Web Key Set"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: Dict[str, Key] = {}
+        self._fetched_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._inflight: Optional[asyncio.Task] = None
+
+    @property
+    def kids(self) -> List[str]:
+        """Key ids currently cached"""
+        return list(self._keys)
+
+    async def get_key(self, kid: str) -> Optional[Key]:
+        """Key for `kid`, fetching or refetching as needed (None if unknown)"""
+        stale = self._fetched_at is not None and time.monotonic() - self._fetched_at > settings.JWKS_TTL_SECONDS
+        if stale and self._may_fetch():
+            self._start_refresh()
+
+        key = self._keys.get(kid)
+        # First fetch or rotation: join a fetch in flight, else start one unless one was just attempted
+        if key is None and self._may_fetch():
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def _may_fetch(self) -> bool:
+        if self._inflight is not None and not self._inflight.done():
+            return True
+        return (
+            self._attempted_at is None
+            or time.monotonic() - self._attempted_at >= settings.JWKS_MIN_REFETCH_SECONDS
+        )
+
+    async def refresh(self) -> None:
+        """Refetch the key set; concurrent callers share one request"""
+        await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._attempted_at = time.monotonic()
+            task = loop.create_task(self._fetch())
+            self._inflight = task
+        return task
+
+    async def _fetch(self) -> None:
+        import httpx  # only needed on (re)fetch; keeps it off the cold-start import path
+
+        try:
+            async with httpx.AsyncClient(timeout=settings.JWKS_FETCH_TIMEOUT) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+                jwks = response.json()
+
+            keys = {}
+            for key in jwks.get('keys', []):
+                if key.get('kty') != 'RSA' or 'kid' not in key:
+                    continue
+                keys[key['kid']] = jwk.construct(key, key.get('alg', 'RS256'))
+        except Exception as e:
+            # Keep serving the previous keys; the next TTL expiry or kid miss retries
+            print(f"JWKS fetch failed ({self.url}): {str(e)}")
+            return
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+
+class TokenVerifier:
+    """RS256 token verification against a JWKS, with a short-lived verified-token cache"""
+
+    def __init__(self, jwks: JWKSManager, audience: Optional[str], issuer: str):
+        self.jwks = jwks
+        self.audience = audience
+        self.issuer = issuer
+        self._verified: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Verify signature and standard claims; returns the token claims (raises JWTError)"""
+        digest = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        claims = self._cached(digest)
+        if claims is not None:
+            return claims
+
+        header = jwt.get_unverified_header(token)
+        key = await self.jwks.get_key(header.get('kid', ''))
+        if key is None:
+            raise JWTError("Unable to find appropriate key")
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=['RS256'],
+            audience=self.audience,
+            issuer=self.issuer,
+        )
+
+        # Never cache past the token's own expiry
+        expires_at = time.time() + settings.VERIFIED_TOKEN_CACHE_TTL
+        if 'exp' in claims:
+            expires_at = min(expires_at, float(claims['exp']))
+        self._remember(digest, claims, expires_at)
+        return claims
+
+    def _cached(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._verified.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._verified[digest]
+                return None
+            self._verified.move_to_end(digest)
+            return claims
+
+    def _remember(self, digest: str, claims: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._verified[digest] = (claims, expires_at)
+            self._verified.move_to_end(digest)
+            while len(self._verified) > settings.VERIFIED_TOKEN_CACHE_SIZE:
+                self._verified.popitem(last=False)
@@ -0,0 +1,108 @@
+"""
+Lazy router mounting - import each domain router on the first request under its prefix
+
+Domain routers pull in boto3, SQLAlchemy, the OpenAI SDK, ARQ, etc. Importing all of
+them in main.py made every Lambda cold start pay for every domain. Instead, main.py
+registers (prefix, module) pairs here and a small ASGI middleware mounts the matching
+router right before the request reaches routing:
+
+    lazy_routers = LazyRouters(app, package=__package__)
+    lazy_routers.add("/api/v1/ai", ".domains.ai.router", tags=["AI 기능"])
+    app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
+
+Requests to /health or /api/v1/subjects only import what those paths need. The
+OpenAPI schema (/docs, /openapi.json) mounts everything first so it stays complete.
+Imports run on a worker thread, so a first request under uvicorn doesn't stall the
+other requests the event loop is serving.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass
+class _LazyRouter:
+    prefix: str
+    module: str
+    tags: List[str] = field(default_factory=list)
+    loaded: bool = False
+
+
+class LazyRouters:
+    """Registry of routers mounted on demand"""
+
+    def __init__(self, app: FastAPI, package: Optional[str] = None):
+        self.app = app
+        self.package = package
+        self._routers: List[_LazyRouter] = []
+        self._lock = threading.RLock()
+        self.load_times: Dict[str, float] = {}
+
+        # The schema must list every route, so generating it mounts all routers first
+        original_openapi: Callable[[], Dict[str, Any]] = app.openapi
+
+        def openapi() -> Dict[str, Any]:
+            self.load_all()
+            return original_openapi()
+
+        app.openapi = openapi
+
+    def add(self, prefix: str, module: str, tags: Optional[List[str]] = None) -> None:
+        """Register a module exposing `router`, mounted under `prefix` when first needed"""
+        self._routers.append(_LazyRouter(prefix.rstrip('/'), module, list(tags or [])))
+
+    def pending(self, path: str) -> List[_LazyRouter]:
+        """Routers not mounted yet that a request to `path` needs (all of them for the schema)"""
+        if path == self.app.openapi_url:
+            return [entry for entry in self._routers if not entry.loaded]
+        return [
+            entry for entry in self._routers
+            if not entry.loaded and (path == entry.prefix or path.startswith(entry.prefix + '/'))
+        ]
+
+    def ensure(self, path: str) -> None:
+        """Mount the router(s) a request to `path` needs (blocking; see LazyRouterMiddleware)"""
+        for entry in self.pending(path):
+            self._load(entry)
+
+    def load_all(self) -> None:
+        """Mount every registered router (OpenAPI, warmup, or LAZY_ROUTERS=False)"""
+        for entry in self._routers:
+            if not entry.loaded:
+                self._load(entry)
+
+    def _load(self, entry: _LazyRouter) -> None:
+        with self._lock:
+            if entry.loaded:
+                return
+            start = time.perf_counter()
+            router = import_module(entry.module, self.package).router
+            self.app.include_router(router, prefix=entry.prefix, tags=entry.tags)
+            self.app.openapi_schema = None  # regenerate with the new routes
+            entry.loaded = True
+            self.load_times[entry.prefix] = round(time.perf_counter() - start, 4)
+
+
+class LazyRouterMiddleware:
+    """Mounts the lazily registered router for each request path before routing"""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] in ('http', 'websocket'):
+            path = scope['path']
+            root_path = scope.get('root_path', '')
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            if self.routers.pending(path):
+                # Heavy SDK imports happen here; keep them off the event loop
+                await anyio.to_thread.run_sync(self.routers.ensure, path)
+        await self.app(scope, receive, send)
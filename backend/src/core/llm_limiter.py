@@ -0,0 +1,284 @@
+"""
+Outbound LLM limiter - per-model concurrency caps and token-per-minute budgets
+
+Every Bedrock/OpenAI call takes a slot from the limiter for its model:
+
+    async with llm_limiter.slot('bedrock', model_id, estimate_tokens(prompt, 4000)) as slot:
+        response = ...
+        slot.actual_tokens = usage  # optional, settles the token estimate
+
+Callers queue in FIFO order until a concurrency slot and enough budget are free,
+and give up with LLMBusyError after LLM_QUEUE_TIMEOUT_SECONDS. A throttling
+response halves the model's concurrency and pauses admissions with exponential
+backoff; successful calls grow the concurrency back (AIMD).
+
+The state is guarded by a threading lock and waiters are woken through their own
+event loop, so one limiter works across loops (TestClient, Mangum) and threads.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from .config import settings
+
+# Provider error codes that mean "slow down" (botocore error codes, compared case-insensitively
+# because Bedrock stream errors use camelCase, e.g. throttlingException)
+THROTTLING_ERROR_CODES = {
+    'throttlingexception',
+    'toomanyrequestsexception',
+    'servicequotaexceededexception',
+    'serviceunavailableexception',
+    'modelnotreadyexception',
+}
+
+
+class LLMBusyError(Exception):
+    """Raised when a call waited longer than the queue timeout for a slot"""
+
+    def __init__(self, model: str, waited: float):
+        super().__init__(f"LLM capacity exhausted for {model} (waited {waited:.1f}s)")
+        self.model = model
+        self.waited = waited
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """True for provider rate-limit responses (botocore ClientError codes or HTTP 429)"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = response.get('Error', {}).get('Code', '')
+        if code.lower() in THROTTLING_ERROR_CODES:
+            return True
+    return getattr(error, 'status_code', None) == 429
+
+
+def count_tokens(text: str) -> int:
+    """Rough, conservative token count for a piece of text"""
+    return math.ceil(len(text) / settings.LLM_CHARS_PER_TOKEN)
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int) -> int:
+    """Conservative token estimate for a call: prompt size plus the full output allowance"""
+    return count_tokens(prompt) + max_output_tokens
+
+
+@dataclass
+class LLMSlot:
+    """An admitted call; set actual_tokens from the response usage when known"""
+
+    reserved_tokens: int
+    waited: float
+    actual_tokens: Optional[int] = None
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ModelLimiter:
+    """Admission control for one (provider, model)"""
+
+    def __init__(self, name: str, max_concurrency: int, tokens_per_minute: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = max(1, tokens_per_minute)
+        self._limit = self.max_concurrency
+        self._tokens = float(self.tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._successes = 0
+        self._queue: Deque[object] = deque()
+        self._waiters: List[asyncio.Future] = []
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._requests = 0
+        self._throttles = 0
+        self._timeouts = 0
+        self._waits: Deque[float] = deque(maxlen=512)
+
+    async def acquire(self, tokens: int, timeout: float) -> float:
+        """Wait for a slot and reserve `tokens`; returns the time spent queued"""
+        loop = asyncio.get_running_loop()
+        need = min(tokens, self.tokens_per_minute)
+        ticket = object()
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._lock:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    delay = self._admission_delay(ticket, need, now)
+                    if delay == 0:
+                        self._queue.popleft()
+                        self._in_flight += 1
+                        self._tokens -= need
+                        self._requests += 1
+                        waited = now - start
+                        self._waits.append(waited)
+                        self._notify_locked()  # the next caller may fit too
+                        return waited
+                    if now >= deadline:
+                        self._timeouts += 1
+                        raise LLMBusyError(self.name, now - start)
+                    waiter = loop.create_future()
+                    self._waiters.append(waiter)
+
+                # Woken by a release, or when the budget/backoff pause allows admission
+                wait = deadline - time.monotonic()
+                if delay is not None:
+                    wait = min(wait, delay)
+                try:
+                    await asyncio.wait_for(waiter, max(wait, 0))
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    with self._lock:
+                        if waiter in self._waiters:
+                            self._waiters.remove(waiter)
+        except BaseException:
+            with self._lock:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._notify_locked()
+            raise
+
+    def release(self, reserved_tokens: int, actual_tokens: Optional[int], throttled: bool) -> None:
+        """Return the slot, settle the token estimate and adapt the concurrency limit"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                reserved = min(reserved_tokens, self.tokens_per_minute)
+                self._tokens = min(float(self.tokens_per_minute), self._tokens + reserved - actual_tokens)
+
+            if throttled:
+                self._throttles += 1
+                self._consecutive_throttles += 1
+                self._successes = 0
+                self._limit = max(1, self._limit // 2)
+                backoff = min(
+                    settings.LLM_BACKOFF_MAX_SECONDS,
+                    settings.LLM_BACKOFF_BASE_SECONDS * 2 ** (self._consecutive_throttles - 1),
+                )
+                self._paused_until = max(self._paused_until, now + backoff)
+                print(f"LLM throttled ({self.name}): concurrency {self._limit}, pausing {backoff:.1f}s")
+            else:
+                self._consecutive_throttles = 0
+                self._successes += 1
+                if self._limit < self.max_concurrency and self._successes >= self._limit:
+                    self._limit += 1
+                    self._successes = 0
+            self._notify_locked()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and queue-wait statistics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            waits = sorted(self._waits)
+            return {
+                "model": self.name,
+                "concurrency_limit": self._limit,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queued": len(self._queue),
+                "tokens_available": int(self._tokens),
+                "tokens_per_minute": self.tokens_per_minute,
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+                "requests": self._requests,
+                "throttles": self._throttles,
+                "timeouts": self._timeouts,
+                "wait_avg": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "wait_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 4) if waits else 0.0,
+                "wait_max": round(waits[-1], 4) if waits else 0.0,
+            }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(float(self.tokens_per_minute), self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _admission_delay(self, ticket: object, need: int, now: float) -> Optional[float]:
+        """0 to admit now, seconds until admission may be possible, or None to wait for a release"""
+        self._refill(now)
+        if self._queue[0] is not ticket:
+            return None
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= self._limit:
+            return None
+        if self._tokens < need:
+            return (need - self._tokens) * 60 / self.tokens_per_minute
+        return 0
+
+    def _notify_locked(self) -> None:
+        for waiter in self._waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+        self._waiters.clear()
+
+
+class LLMLimiter:
+    """Process-wide registry of per-model limiters"""
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider: str, model: str) -> ModelLimiter:
+        """Limiter for a model, created from LLM_MODEL_LIMITS or the defaults"""
+        key = (provider, model)
+        limiter = self._limiters.get(key)
+        if limiter is not None:
+            return limiter
+
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limits = settings.LLM_MODEL_LIMITS.get(model, {})
+                limiter = ModelLimiter(
+                    f"{provider}:{model}",
+                    limits.get('max_concurrency', settings.LLM_DEFAULT_MAX_CONCURRENCY),
+                    limits.get('tokens_per_minute', settings.LLM_DEFAULT_TOKENS_PER_MINUTE),
+                )
+                self._limiters[key] = limiter
+            return limiter
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str, estimated_tokens: int) -> AsyncIterator[LLMSlot]:
+        """Hold a slot for the duration of one call (including a whole stream)"""
+        limiter = self.limiter(provider, model)
+        waited = await limiter.acquire(estimated_tokens, settings.LLM_QUEUE_TIMEOUT_SECONDS)
+        slot = LLMSlot(reserved_tokens=estimated_tokens, waited=waited)
+        throttled = False
+        try:
+            yield slot
+        except BaseException as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            limiter.release(slot.reserved_tokens, slot.actual_tokens, throttled)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Snapshots of every limiter created so far"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.snapshot() for limiter in limiters]
+
+    def clear(self) -> None:
+        """Drop all limiters (e.g. after changing limits)"""
+        with self._lock:
+            self._limiters.clear()
+
+
+llm_limiter = LLMLimiter()
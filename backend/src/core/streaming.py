@@ -0,0 +1,128 @@
+"""
+Streaming helpers - bridge blocking iterators (e.g. boto3 EventStream) to asyncio
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+
+from .config import settings
+
+T = TypeVar('T')
+
+# Each active stream occupies one thread for its whole lifetime, so streams get
+# their own pool instead of starving asyncio.to_thread / the default executor.
+_stream_executor = ThreadPoolExecutor(
+    max_workers=settings.STREAM_BRIDGE_MAX_THREADS,
+    thread_name_prefix='stream',
+)
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def iterate_in_thread(produce: Callable[[], Iterable[T]], max_buffered: int = 64) -> AsyncIterator[T]:
+    """Iterate a blocking iterable in a worker thread and yield its items asynchronously
+
+    `produce` is called in the worker thread, so blocking setup (e.g. opening the
+    HTTP stream) stays off the event loop too. At most `max_buffered` items are
+    queued; the producer blocks when the consumer falls behind (backpressure).
+    If the consumer stops early, the producer is told to stop and the iterable
+    is closed (generators run their `finally`).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max_buffered)
+    stopped = threading.Event()
+
+    def put(item) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def run() -> None:
+        iterator = None
+        try:
+            iterator = iter(produce())
+            for item in iterator:
+                # Wait for buffer space, re-checking for cancellation
+                while not slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                put(item)
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    future = loop.run_in_executor(_stream_executor, run)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            slots.release()
+            yield item
+    finally:
+        stopped.set()
+        # Don't wait for the producer: it notices `stopped` within 0.1s or on its next item
+        future.add_done_callback(lambda f: f.exception())
+
+
+async def coalesce_text(chunks: AsyncIterator[str], max_chars: int, max_delay: float) -> AsyncIterator[str]:
+    """Merge small text chunks: flush once `max_chars` are buffered or `max_delay`
+    seconds have passed since the first buffered chunk (0 disables that limit)"""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def feed() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+            await queue.put(_DONE)
+        except BaseException as e:
+            await queue.put(_Failure(e))
+            raise
+
+    feeder = asyncio.create_task(feed())
+    buffer: list = []
+    buffered_chars = 0
+    deadline = None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _DONE or isinstance(item, _Failure):
+                if buffer:
+                    yield ''.join(buffer)
+                if isinstance(item, _Failure):
+                    raise item.error
+                return
+
+            if item is not None:
+                buffer.append(item)
+                buffered_chars += len(item)
+                if deadline is None and max_delay > 0:
+                    deadline = time.monotonic() + max_delay
+
+            window_elapsed = deadline is not None and time.monotonic() >= deadline
+            if buffer and (window_elapsed or (max_chars > 0 and buffered_chars >= max_chars)
+                           or (max_chars <= 0 and max_delay <= 0)):
+                yield ''.join(buffer)
+                buffer, buffered_chars, deadline = [], 0, None
+    finally:
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
@@ -10,25 +10,19 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+from .core.jwks import JWKSManager, TokenVerifier
+
 security = HTTPBearer(auto_error=False)  # auto_error=False로 설정하여 토큰 없이도 허용
 
 # Cognito 설정
 COGNITO_REGION = os.getenv('AWS_REGION', 'us-east-1')
 COGNITO_USER_POOL_ID = os.getenv('COGNITO_USER_POOL_ID', 'us-east-1_LBzH1bqb8')
 COGNITO_CLIENT_ID = os.getenv('COGNITO_CLIENT_ID', '6avv0p8tgn757n8qpfdco8kdl6')
+COGNITO_ISSUER = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}'
 
-# JWK 키 캐싱 (성능 향상)
-_jwks = None
-
-
-def get_jwks():
-    """Cognito의 JWK 키 가져오기 (캐싱)"""
-    global _jwks
-    if _jwks is None:
-        import requests
-        url = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json'
-        _jwks = requests.get(url).json()
-    return _jwks
+# JWK 키 캐싱 (TTL 지나면 백그라운드 갱신, 모르는 kid면 한 번만 다시 조회) + 검증된 토큰 캐시
+cognito_jwks = JWKSManager(f'{COGNITO_ISSUER}/.well-known/jwks.json')
+cognito_token_verifier = TokenVerifier(cognito_jwks, audience=COGNITO_CLIENT_ID, issuer=COGNITO_ISSUER)
 
 
 # 사용자 모델
@@ -49,37 +43,8 @@ async def get_current_user(
     token = credentials.credentials
 
     try:
-        # JWT 헤더 디코딩 (검증 없이)
-        unverified_header = jwt.get_unverified_header(token)
-
-        # JWK에서 올바른 키 찾기
-        jwks = get_jwks()
-        rsa_key = {}
-        for key in jwks['keys']:
-            if key['kid'] == unverified_header['kid']:
-                rsa_key = {
-                    'kty': key['kty'],
-                    'kid': key['kid'],
-                    'use': key['use'],
-                    'n': key['n'],
-                    'e': key['e']
-                }
-                break
-
-        if not rsa_key:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Unable to find appropriate key"
-            )
-
-        # 토큰 검증 및 디코딩
-        payload = jwt.decode(
-            token,
-            rsa_key,
-            algorithms=['RS256'],
-            audience=COGNITO_CLIENT_ID,
-            issuer=f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}'
-        )
+        # 토큰 검증 및 디코딩 (같은 토큰은 잠시 동안 재검증 생략)
+        payload = await cognito_token_verifier.verify(token)
 
         # 사용자 정보 추출
         user_id = payload.get('sub')
@@ -1,10 +1,10 @@
 """
 AI domain models - AI 문제 생성 및 튜터
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ...core.database import Base
@@ -45,4 +45,28 @@ class AITutorConversation(Base):
     # 토큰 사용량 (옵션)
     token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # 같은 초에 저장된 질문/답변 순서를 구분하도록 마이크로초까지 기록
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now()
+    )
+
+
+class AITutorSummary(Base):
+    """AI 튜터 대화 요약 (오래된 대화를 압축한 누적 요약, 대화당 1개)"""
+
+    __tablename__ = "ai_tutor_summaries"
+    __table_args__ = (UniqueConstraint("user_id", "conversation_id"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    conversation_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # 이 시각까지의 메시지가 요약에 포함됨 (이후 메시지만 원문으로 프롬프트에 사용)
+    summarized_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    summarized_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
+    )
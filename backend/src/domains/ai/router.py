@@ -1,7 +1,11 @@
 """
 AI domain router - AI 문제 생성 및 튜터
 """
+import json
+
+import anyio
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.database import get_db
@@ -23,6 +27,40 @@ async def ai_tutor_chat(
     return await service.chat_with_tutor(current_user.id, request)
 
 
+@router.post("/tutor/stream")
+async def ai_tutor_chat_stream(
+    request: AITutorRequest,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(get_db),
+):
+    """AI 튜터와 대화하기 (스트리밍, 첫 이벤트에 conversation_id)"""
+    service = AIService(db)
+    conversation_id, chunks = await service.start_tutor_stream(current_user.id, request)
+
+    async def generate():
+        yield f"data: {json.dumps({'conversation_id': conversation_id})}\n\n"
+        try:
+            async for chunk in chunks:
+                yield f"data: {json.dumps({'text': chunk})}\n\n"
+        except Exception as e:
+            print(f"AI 튜터 스트리밍 오류: {str(e)}")
+            yield f"data: {json.dumps({'error': 'AI 응답 생성 중 오류가 발생했습니다.'})}\n\n"
+        finally:
+            # 클라이언트가 끊어도 지금까지 생성된 답변 저장 (연결 종료 시 취소되므로 보호)
+            with anyio.CancelScope(shield=True):
+                await chunks.aclose()
+        yield f"data: {json.dumps({'done': True, 'conversation_id': conversation_id})}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/tutor/conversations")
 async def list_conversations(
     current_user: CurrentUser,
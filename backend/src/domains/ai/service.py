@@ -1,22 +1,38 @@
 """
 AI service - OpenAI chatbot with SQLite
+
+Conversation memory: once the raw turns after the stored summary exceed
+TUTOR_COMPACT_TRIGGER_TOKENS, the older ones are folded into a rolling summary
+row (AITutorSummary). Prompts are built from the summary plus the most recent
+turns that fit TUTOR_PROMPT_TOKEN_BUDGET, so per-turn cost stays flat.
 """
-from typing import List
+from datetime import datetime, timezone
+from typing import AsyncGenerator, List, Tuple
 from uuid import uuid4
 
-from openai import AsyncOpenAI
+import anyio
+from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.config import settings
-from .models import AITutorConversation
+from ...core.database import async_session_maker
+from ...core.llm_limiter import LLMBusyError, count_tokens, estimate_tokens, llm_limiter
+from .models import AITutorConversation, AITutorSummary
 from .schemas import AITutorRequest, AITutorResponse
 
+TUTOR_SYSTEM_PROMPT = """You are a kind and helpful learning assistant.
+Please answer students' questions clearly and in an easy-to-understand manner.
+Rather than simply giving answers, explain in a way that helps students understand on their own.
+When necessary, provide examples and offer encouragement and support."""
+
 
 class AIService:
     """AI tutor service"""
 
     def __init__(self, db: AsyncSession):
+        from openai import AsyncOpenAI  # heavy SDK; keep it off the cold-start import path
+
         self.db = db
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
@@ -29,22 +45,23 @@ class AIService:
         # Generate or reuse conversation ID
         conversation_id = request.conversation_id or str(uuid4())
 
-        # Get conversation history (last 10 messages)
-        conversation_history = await self._get_conversation_history(
-            user_id, conversation_id, limit=10
-        )
-
-        # Build messages for OpenAI API
-        messages = self._build_messages(conversation_history, request.message)
+        # Build messages for OpenAI API (summary + recent turns under the token budget)
+        messages = await self._build_prompt(user_id, conversation_id, request.message)
 
-        # Call OpenAI API
+        # Call OpenAI API (through the shared outbound limiter)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000,
-            )
+            prompt_text = "".join(message["content"] for message in messages)
+            async with llm_limiter.slot(
+                "openai", self.model, estimate_tokens(prompt_text, 1000)
+            ) as slot:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000,
+                )
+                if response.usage:
+                    slot.actual_tokens = response.usage.total_tokens
 
             assistant_message = response.choices[0].message.content
             total_tokens = response.usage.total_tokens
@@ -70,9 +87,77 @@ class AIService:
                 message=assistant_message, conversation_id=conversation_id
             )
 
+        except LLMBusyError:
+            raise
         except Exception as e:
             raise Exception(f"OpenAI API call failed: {str(e)}")
 
+    async def start_tutor_stream(
+        self, user_id: str, request: AITutorRequest
+    ) -> Tuple[str, AsyncGenerator[str, None]]:
+        """Start a streaming tutor reply
+
+        The user message is saved before anything is streamed. The returned
+        generator yields reply text deltas and saves the assistant message when
+        the stream ends, including a partial reply if the client disconnects.
+        """
+        conversation_id = request.conversation_id or str(uuid4())
+        messages = await self._build_prompt(user_id, conversation_id, request.message)
+
+        # Save user message
+        await self._save_message(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            role="user",
+            message=request.message,
+        )
+
+        return conversation_id, self._stream_reply(user_id, conversation_id, messages)
+
+    async def _stream_reply(
+        self, user_id: str, conversation_id: str, messages: List[dict]
+    ) -> AsyncGenerator[str, None]:
+        """Stream an OpenAI completion and persist whatever was generated"""
+        reply = ""
+        total_tokens = None
+        try:
+            prompt_text = "".join(message["content"] for message in messages)
+            async with llm_limiter.slot(
+                "openai", self.model, estimate_tokens(prompt_text, 1000)
+            ) as slot:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                async for chunk in stream:
+                    if chunk.usage:
+                        total_tokens = chunk.usage.total_tokens
+                        slot.actual_tokens = total_tokens
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        text = chunk.choices[0].delta.content
+                        reply += text
+                        yield text
+        finally:
+            # The request's session may already be closed when the response stream
+            # ends (or is abandoned), so the reply is saved with its own session.
+            # On client disconnect the response task group is cancelled; shield the
+            # save so the partial reply still reaches the database.
+            if reply:
+                with anyio.CancelScope(shield=True):
+                    async with async_session_maker() as db:
+                        await self._save_message(
+                            user_id=user_id,
+                            conversation_id=conversation_id,
+                            role="assistant",
+                            message=reply,
+                            token_count=total_tokens,
+                            db=db,
+                        )
+
     async def _get_conversation_history(
         self, user_id: str, conversation_id: str, limit: int = 10
     ) -> List[AITutorConversation]:
@@ -92,23 +177,171 @@ class AIService:
 
         return list(reversed(conversations))  # Return in chronological order
 
-    def _build_messages(
-        self, history: List[AITutorConversation], new_message: str
+    async def _get_summary(
+        self, user_id: str, conversation_id: str
+    ) -> AITutorSummary | None:
+        """Get the rolling summary of a conversation, if any"""
+        stmt = select(AITutorSummary).where(
+            AITutorSummary.user_id == user_id,
+            AITutorSummary.conversation_id == conversation_id,
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def _get_unsummarized_history(
+        self, user_id: str, conversation_id: str, summary: AITutorSummary | None
+    ) -> List[AITutorConversation]:
+        """Get messages not yet folded into the summary (chronological order)
+
+        Only the newest TUTOR_HISTORY_FETCH_LIMIT messages are loaded, so a
+        conversation whose compaction keeps failing doesn't load an ever-growing
+        history every turn. Older messages beyond that window are left out of the
+        summary once a later compaction succeeds.
+        """
+        stmt = select(AITutorConversation).where(
+            AITutorConversation.user_id == user_id,
+            AITutorConversation.conversation_id == conversation_id,
+        )
+        if summary is not None:
+            stmt = stmt.where(AITutorConversation.created_at > summary.summarized_until)
+        stmt = stmt.order_by(AITutorConversation.created_at.desc()).limit(
+            settings.TUTOR_HISTORY_FETCH_LIMIT
+        )
+
+        result = await self.db.execute(stmt)
+        return list(reversed(result.scalars().all()))  # Return in chronological order
+
+    async def _build_prompt(
+        self, user_id: str, conversation_id: str, new_message: str
     ) -> List[dict]:
-        """Build messages for OpenAI"""
+        """Build the prompt, compacting older turns into the summary when over budget"""
+        # A message that can't fit next to the system prompt is rejected before anything is saved
+        if count_tokens(TUTOR_SYSTEM_PROMPT) + count_tokens(new_message) > settings.TUTOR_PROMPT_TOKEN_BUDGET:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="메시지가 너무 깁니다. 내용을 나눠서 질문해 주세요."
+            )
+
+        summary = await self._get_summary(user_id, conversation_id)
+        history = await self._get_unsummarized_history(user_id, conversation_id, summary)
+
+        history_tokens = sum(count_tokens(conv.message) for conv in history)
+        if history_tokens > settings.TUTOR_COMPACT_TRIGGER_TOKENS:
+            # Keep up to TUTOR_RECENT_MESSAGES turns verbatim, but no more than half the
+            # trigger, so the next compaction happens only after that much new history
+            keep = 0
+            kept_tokens = 0
+            for conv in reversed(history[-settings.TUTOR_RECENT_MESSAGES:] if settings.TUTOR_RECENT_MESSAGES else []):
+                kept_tokens += count_tokens(conv.message)
+                if kept_tokens > settings.TUTOR_COMPACT_TRIGGER_TOKENS // 2:
+                    break
+                keep += 1
+            try:
+                summary = await self._compact(
+                    user_id, conversation_id, summary, history[:len(history) - keep]
+                )
+                history = history[len(history) - keep:]
+            except LLMBusyError:
+                raise
+            except Exception as e:
+                # Fall back to the budgeted recent turns; compaction is retried next turn
+                print(f"Conversation compaction failed ({conversation_id}): {str(e)}")
+
+        return self._build_messages(
+            history, new_message, summary.summary if summary else None
+        )
+
+    async def _compact(
+        self,
+        user_id: str,
+        conversation_id: str,
+        summary: AITutorSummary | None,
+        turns: List[AITutorConversation],
+    ) -> AITutorSummary:
+        """Fold older turns into the stored rolling summary"""
+        transcript = "\n".join(f"{conv.role}: {conv.message}" for conv in turns)
         messages = [
             {
                 "role": "system",
-                "content": """You are a kind and helpful learning assistant.
-Please answer students' questions clearly and in an easy-to-understand manner.
-Rather than simply giving answers, explain in a way that helps students understand on their own.
-When necessary, provide examples and offer encouragement and support.""",
-            }
+                "content": """You maintain the memory of a tutoring conversation.
+Merge the existing summary and the new turns into one concise summary, written in the conversation's language.
+Keep the student's goals, level, misunderstandings, topics covered, and any facts or answers they may refer back to.
+Drop greetings and small talk.""",
+            },
+            {
+                "role": "user",
+                "content": f"Existing summary:\n{summary.summary if summary else '(none)'}\n\nNew turns:\n{transcript}",
+            },
         ]
 
-        # Add previous conversations
-        for conv in history:
-            messages.append({"role": conv.role, "content": conv.message})
+        prompt_text = "".join(message["content"] for message in messages)
+        async with llm_limiter.slot(
+            "openai", self.model, estimate_tokens(prompt_text, settings.TUTOR_SUMMARY_MAX_TOKENS)
+        ) as slot:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=settings.TUTOR_SUMMARY_MAX_TOKENS,
+            )
+            if response.usage:
+                slot.actual_tokens = response.usage.total_tokens
+
+        text = response.choices[0].message.content.strip()
+        if summary is None:
+            summary = AITutorSummary(
+                user_id=user_id,
+                conversation_id=conversation_id,
+                summary=text,
+                summarized_until=turns[-1].created_at,
+                summarized_count=len(turns),
+            )
+            self.db.add(summary)
+        else:
+            summary.summary = text
+            summary.summarized_until = turns[-1].created_at
+            summary.summarized_count += len(turns)
+            summary.updated_at = datetime.now(timezone.utc)
+
+        await self.db.commit()
+        return summary
+
+    def _build_messages(
+        self,
+        history: List[AITutorConversation],
+        new_message: str,
+        summary: str | None = None,
+    ) -> List[dict]:
+        """Build messages for OpenAI (never more than TUTOR_PROMPT_TOKEN_BUDGET)
+
+        The system prompt and the new message always fit (_build_prompt rejects
+        longer messages); the summary is truncated to what is left, and then the
+        newest turns are added while they fit.
+        """
+        messages = [{"role": "system", "content": TUTOR_SYSTEM_PROMPT}]
+        budget = (
+            settings.TUTOR_PROMPT_TOKEN_BUDGET
+            - count_tokens(TUTOR_SYSTEM_PROMPT)
+            - count_tokens(new_message)
+        )
+
+        # Add summary of earlier conversation
+        if summary:
+            content = f"Summary of the earlier conversation:\n{summary}"
+            if count_tokens(content) > budget:
+                content = content[:max(0, int(budget * settings.LLM_CHARS_PER_TOKEN))]
+            if content:
+                messages.append({"role": "system", "content": content})
+                budget -= count_tokens(content)
+
+        # Add previous conversations, newest first, until the budget runs out
+        recent: List[dict] = []
+        for conv in reversed(history):
+            budget -= count_tokens(conv.message)
+            if budget < 0:
+                break
+            recent.append({"role": conv.role, "content": conv.message})
+        messages.extend(reversed(recent))
 
         # Add new message
         messages.append({"role": "user", "content": new_message})
@@ -122,8 +355,10 @@ When necessary, provide examples and offer encouragement and support.""",
         role: str,
         message: str,
         token_count: int | None = None,
+        db: AsyncSession | None = None,
     ):
         """Save message to database"""
+        db = db or self.db
         conversation = AITutorConversation(
             user_id=user_id,
             conversation_id=conversation_id,
@@ -132,9 +367,9 @@ When necessary, provide examples and offer encouragement and support.""",
             token_count=token_count,
         )
 
-        self.db.add(conversation)
-        await self.db.commit()
-        await self.db.refresh(conversation)
+        db.add(conversation)
+        await db.commit()
+        await db.refresh(conversation)
 
     async def get_user_conversations(self, user_id: str) -> List[dict]:
         """Get user's conversation list (grouped by conversation_id)"""
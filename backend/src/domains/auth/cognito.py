@@ -0,0 +1,130 @@
+"""
+Auth domain Cognito gateway - 이벤트 루프를 막지 않는 Cognito 호출
+
+boto3 호출은 전용 스레드 풀(COGNITO_MAX_CONCURRENCY개)에서 실행하므로
+로그인이 몰려도 다른 API 요청은 계속 처리됩니다. 풀이 가득 차면 호출은 대기하고,
+대기 + 호출 전체가 COGNITO_CALL_TIMEOUT을 넘으면 504를 반환합니다.
+일시적인 오류(스로틀링, 5xx, 연결 오류) 재시도는 botocore 재시도 설정
+(core/aws.py, COGNITO_MAX_ATTEMPTS)이 담당합니다.
+
+클라이언트와 스레드 풀은 첫 호출 때 만들어 콜드 스타트 import 시간을 늘리지 않습니다.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Annotated, Any, Callable, Deque, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from fastapi import Depends, HTTPException, status
+
+from ...core.aws import get_cognito_client
+from ...core.config import settings
+
+
+class _OperationStats:
+    """작업별 호출 지연 시간 통계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latencies: Deque[float] = deque(maxlen=512)
+
+    def snapshot(self, operation: str) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "operation": operation,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency_avg": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "latency_p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4) if latencies else 0.0,
+            "latency_max": round(latencies[-1], 4) if latencies else 0.0,
+        }
+
+
+class CognitoGateway:
+    """스레드 풀에서 Cognito API를 호출하는 비동기 래퍼"""
+
+    def __init__(self, client_factory: Callable[[], Any] = get_cognito_client):
+        self._client_factory = client_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats: Dict[str, _OperationStats] = {}
+        self._lock = threading.Lock()
+
+    async def call(self, operation: str, **params: Any) -> Dict[str, Any]:
+        """cognito-idp 작업 호출 (예: call('initiate_auth', ClientId=..., ...))
+
+        ClientError는 그대로 전달하고, 스로틀링은 503, 시간 초과는 504로 변환합니다.
+        """
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        timed_out = failed = False
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), partial(self._invoke, operation, params)),
+                settings.COGNITO_CALL_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+            print(f"Cognito {operation} timed out after {time.monotonic() - start:.1f}s")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="인증 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
+            )
+        except ClientError as e:
+            failed = True
+            if e.response.get('Error', {}).get('Code') == 'TooManyRequestsException':
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="요청이 많아 잠시 후 다시 시도해주세요."
+                )
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(operation, time.monotonic() - start, failed, timed_out)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """작업별 호출 수, 오류 수, 지연 시간(avg/p95/max)"""
+        with self._lock:
+            return [stats.snapshot(operation) for operation, stats in self._stats.items()]
+
+    def _invoke(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        # 클라이언트 생성도 워커 스레드에서 (첫 호출의 생성 비용이 루프를 막지 않도록)
+        return getattr(self._client_factory(), operation)(**params)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.COGNITO_MAX_CONCURRENCY,
+                        thread_name_prefix='cognito',
+                    )
+        return self._executor
+
+    def _record(self, operation: str, elapsed: float, failed: bool, timed_out: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(operation, _OperationStats())
+            stats.calls += 1
+            stats.latencies.append(elapsed)
+            if failed:
+                stats.errors += 1
+            if timed_out:
+                stats.timeouts += 1
+
+
+cognito_gateway = CognitoGateway()
+
+
+def get_cognito() -> CognitoGateway:
+    """공용 Cognito 게이트웨이"""
+    return cognito_gateway
+
+
+Cognito = Annotated[CognitoGateway, Depends(get_cognito)]
@@ -2,27 +2,26 @@
 Auth domain router - AWS Cognito 기반 인증
 """
 import os
-import boto3
+
 from botocore.exceptions import ClientError
 from fastapi import APIRouter, HTTPException, status
 
+from .cognito import Cognito
 from .schemas import LoginRequest, RegisterRequest, TokenResponse
 
 router = APIRouter()
 
-# Cognito 클라이언트 초기화
-cognito_client = boto3.client('cognito-idp', region_name=os.getenv('AWS_REGION', 'us-east-1'))
-
 USER_POOL_ID = os.getenv('COGNITO_USER_POOL_ID', 'us-east-1_LBzH1bqb8')
 CLIENT_ID = os.getenv('COGNITO_CLIENT_ID', '6avv0p8tgn757n8qpfdco8kdl6')
 
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register(request: RegisterRequest):
+async def register(request: RegisterRequest, cognito: Cognito):
     """Cognito에 새 사용자 등록 (이메일 인증 필요)"""
     try:
         # Cognito에 사용자 생성
-        response = cognito_client.sign_up(
+        response = await cognito.call(
+            'sign_up',
             ClientId=CLIENT_ID,
             Username=request.email,
             Password=request.password,
@@ -58,10 +57,11 @@ async def register(request: RegisterRequest):
 
 
 @router.post("/confirm", status_code=status.HTTP_200_OK)
-async def confirm_sign_up(email: str, code: str):
+async def confirm_sign_up(email: str, code: str, cognito: Cognito):
     """이메일 인증 코드 확인"""
     try:
-        cognito_client.confirm_sign_up(
+        await cognito.call(
+            'confirm_sign_up',
             ClientId=CLIENT_ID,
             Username=email,
             ConfirmationCode=code
@@ -92,10 +92,11 @@ async def confirm_sign_up(email: str, code: str):
 
 
 @router.post("/resend-code", status_code=status.HTTP_200_OK)
-async def resend_confirmation_code(email: str):
+async def resend_confirmation_code(email: str, cognito: Cognito):
     """인증 코드 재발송"""
     try:
-        cognito_client.resend_confirmation_code(
+        await cognito.call(
+            'resend_confirmation_code',
             ClientId=CLIENT_ID,
             Username=email
         )
@@ -113,10 +114,11 @@ async def resend_confirmation_code(email: str):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, cognito: Cognito):
     """Cognito를 통한 로그인"""
     try:
-        response = cognito_client.initiate_auth(
+        response = await cognito.call(
+            'initiate_auth',
             ClientId=CLIENT_ID,
             AuthFlow='USER_PASSWORD_AUTH',
             AuthParameters={
@@ -151,10 +153,11 @@ async def login(request: LoginRequest):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(refresh_token: str):
+async def refresh_token(refresh_token: str, cognito: Cognito):
     """리프레시 토큰으로 새 액세스 토큰 발급"""
     try:
-        response = cognito_client.initiate_auth(
+        response = await cognito.call(
+            'initiate_auth',
             ClientId=CLIENT_ID,
             AuthFlow='REFRESH_TOKEN_AUTH',
             AuthParameters={
@@ -0,0 +1,80 @@
+"""
+Subject domain chunking - 긴 OCR 텍스트를 AI 처리 단위로 분할
+
+페이지 구분(폼피드, '--- 페이지 2 ---' 같은 구분선)과 마크다운 제목에서 먼저 나누고,
+한 구간이 너무 길면 문단 -> 줄 -> 글자 수 순으로 더 잘게 나눕니다.
+나눈 구간은 순서를 유지한 채 max_chars 이하로 다시 묶습니다.
+"""
+import re
+from typing import List
+
+# 페이지 구분선: ---, ===, --- 페이지 2 ---, [Page 3], p.4 등
+_PAGE_MARKER = re.compile(
+    r'^\s*(?:[-=]{3,}.*|\[?\s*(?:page|페이지|p\.)\s*\d+\s*\]?(?:\s*[-=]+)?)\s*$',
+    re.IGNORECASE
+)
+_HEADING = re.compile(r'^\s{0,3}#{1,6}\s')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+def _split_sections(text: str) -> List[str]:
+    """페이지 구분과 제목 앞에서 구간 나누기 (폼피드는 제거, 구분선/제목은 다음 구간에 포함)"""
+    sections: List[str] = []
+    current: List[str] = []
+    has_body = False  # 구분선/제목 외의 본문이 있는지 (구분선 바로 뒤 제목은 같은 구간)
+    for line in text.replace('\r\n', '\n').replace('\f', '\n\f\n').split('\n'):
+        is_form_feed = line == '\f'
+        is_page_break = is_form_feed or bool(_PAGE_MARKER.match(line))
+        if is_page_break or (_HEADING.match(line) and has_body):
+            if any(l.strip() for l in current):
+                sections.append('\n'.join(current).strip('\n'))
+            current = []
+            has_body = False
+            if is_form_feed:
+                continue
+        elif line.strip() and not _HEADING.match(line):
+            has_body = True
+        current.append(line)
+    if any(l.strip() for l in current):
+        sections.append('\n'.join(current).strip('\n'))
+    return sections
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """max_chars보다 긴 구간을 문단 -> 줄 -> 글자 수 순으로 분할"""
+    if len(section) <= max_chars:
+        return [section]
+    for pattern, separator in ((_PARAGRAPH_BREAK, '\n\n'), (re.compile(r'\n'), '\n')):
+        parts = [p for p in pattern.split(section) if p.strip()]
+        if len(parts) > 1:
+            pieces: List[str] = []
+            for part in parts:
+                pieces.extend(_split_oversized(part, max_chars))
+            return _pack(pieces, max_chars, separator)
+    return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+
+
+def _pack(pieces: List[str], max_chars: int, separator: str) -> List[str]:
+    """순서를 유지하면서 인접한 조각을 max_chars 이하로 묶기"""
+    chunks: List[str] = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """텍스트를 max_chars 이하 조각 목록으로 분할 (짧으면 원문 그대로 한 조각)"""
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for section in _split_sections(text):
+        pieces.extend(_split_oversized(section, max_chars))
+    return _pack(pieces, max_chars, '\n\n') or [text]
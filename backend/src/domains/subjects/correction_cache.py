@@ -0,0 +1,169 @@
+"""
+Subject domain correction cache - AI 교정/노트 생성 결과 캐시
+
+키: (모델 ID, 프롬프트 버전, 원문 SHA-256)
+1단계: 프로세스 내 LRU (웜 Lambda / 같은 워커의 재요청)
+2단계: 영구 저장소 (AI_CACHE_TABLE이 있으면 DynamoDB + TTL, 없으면 로컬 SQLite)
+
+영구 저장소 오류는 캐시 미스로 처리하고 요청은 그대로 진행합니다.
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional, Protocol, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from ...core.config import settings
+from ...core.dynamodb import DynamoDBProvider, dynamodb_provider
+
+
+class CacheStore(Protocol):
+    """영구 캐시 저장소 - 값과 만료 시각(epoch 초)을 저장"""
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]: ...
+
+    def put(self, key: str, value: str, expires_at: float) -> None: ...
+
+
+class DynamoDBCacheStore:
+    """DynamoDB 캐시 저장소 (expires_at을 테이블 TTL 속성으로 사용)"""
+
+    def __init__(self, table_name: str, db: DynamoDBProvider = dynamodb_provider):
+        self.table_name = table_name
+        self.db = db
+
+    @property
+    def table(self):
+        return self.db.table(self.table_name)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        response = self.table.get_item(Key={'cache_key': key})
+        item = response.get('Item')
+        # TTL 삭제는 지연될 수 있으므로 읽을 때도 만료 확인
+        if not item or item['expires_at'] <= time.time():
+            return None
+        return item['value'], float(item['expires_at'])
+
+    def put(self, key: str, value: str, expires_at: float) -> None:
+        self.table.put_item(Item={'cache_key': key, 'value': value, 'expires_at': int(expires_at)})
+
+
+class SQLiteCacheStore:
+    """로컬 개발용 SQLite 캐시 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS correction_cache '
+                '(cache_key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # 성공하면 commit, 예외면 rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT value, expires_at FROM correction_cache WHERE cache_key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, value: str, expires_at: float) -> None:
+        with self._connect() as conn:
+            conn.execute('DELETE FROM correction_cache WHERE expires_at <= ?', (time.time(),))
+            conn.execute(
+                'INSERT OR REPLACE INTO correction_cache (cache_key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, expires_at)
+            )
+
+
+class CorrectionCache:
+    """2단계(LRU + 영구 저장소) 교정 결과 캐시"""
+
+    def __init__(self, store: Optional[CacheStore], max_entries: int, ttl_seconds: int):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_id: str, prompt_version: str, text: str) -> str:
+        """캐시 키 생성 - 프롬프트를 바꾸면 prompt_version을 올려서 이전 결과를 무효화"""
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{model_id}#{prompt_version}#{digest}"
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (LRU -> 영구 저장소, 영구 저장소에서 찾으면 LRU에 채움)"""
+        value = self._get_local(key)
+        if value is not None or self.store is None:
+            return value
+
+        try:
+            found = await asyncio.to_thread(self.store.get, key)
+        except (ClientError, BotoCoreError, sqlite3.Error) as e:
+            print(f"교정 캐시 조회 실패: {str(e)}")
+            return None
+        if not found:
+            return None
+
+        value, expires_at = found
+        self._set_local(key, value, expires_at)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """캐시 저장 (LRU + 영구 저장소)"""
+        expires_at = time.time() + self.ttl_seconds
+        self._set_local(key, value, expires_at)
+        if self.store is None:
+            return
+
+        try:
+            await asyncio.to_thread(self.store.put, key, value, expires_at)
+        except (ClientError, BotoCoreError, sqlite3.Error) as e:
+            print(f"교정 캐시 저장 실패: {str(e)}")
+
+    def _get_local(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@lru_cache
+def get_correction_cache() -> CorrectionCache:
+    """프로세스 공용 교정 캐시 (설정에 따라 영구 저장소 선택)"""
+    if settings.AI_CACHE_TABLE:
+        store: Optional[CacheStore] = DynamoDBCacheStore(settings.AI_CACHE_TABLE)
+    elif settings.AI_CACHE_SQLITE_PATH:
+        store = SQLiteCacheStore(settings.AI_CACHE_SQLITE_PATH)
+    else:
+        store = None
+    return CorrectionCache(store, settings.AI_CACHE_MAX_ENTRIES, settings.AI_CACHE_TTL_SECONDS)
@@ -0,0 +1,161 @@
+"""
+Subject domain images - 업로드 이미지 키 규칙과 파생본(썸네일, WebP/AVIF) 생성
+
+리사이즈/인코딩은 CPU 작업이므로 프로세스 풀에서 실행합니다.
+Lambda처럼 멀티프로세싱을 쓸 수 없는 환경에서는 스레드 풀로 대체합니다.
+(Pillow는 디코딩/리사이즈/인코딩 중에 GIL을 놓기 때문에 스레드로도 병렬 처리됩니다)
+"""
+import asyncio
+import io
+import os
+import posixpath
+import re
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# 이미지 업로드 S3 버킷
+IMAGE_BUCKET_NAME = os.getenv('IMAGE_BUCKET_NAME', 'ocr-images-storage-1761916475')
+
+# 내용 해시(SHA-256)로 이름 붙인 키 (images/{user_id}/{sha256}.{확장자})
+_CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# 파생본 생성 동시 작업 수
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    """파생본 규격 (max_width 이하로 축소, 세로는 가로의 2배까지)"""
+
+    max_width: int
+    format: str
+    extension: str
+    content_type: str
+    quality: int
+
+
+# 목록 카드용 썸네일과 상세 화면용 축소본
+DERIVATIVES: Dict[str, DerivativeSpec] = {
+    'thumb': DerivativeSpec(320, 'WEBP', 'webp', 'image/webp', 75),
+    'medium': DerivativeSpec(1280, 'WEBP', 'webp', 'image/webp', 80),
+    'medium-avif': DerivativeSpec(1280, 'AVIF', 'avif', 'image/avif', 60),
+}
+
+THUMBNAIL = 'thumb'
+
+
+def _extension(filename: Optional[str]) -> str:
+    return filename.split('.')[-1] if filename and '.' in filename else 'jpg'
+
+
+def new_image_key(user_id: str, filename: Optional[str]) -> str:
+    """업로드할 이미지의 고유 S3 키 생성 (images/{user_id}/{uuid}.{확장자})"""
+    return f"images/{user_id}/{uuid.uuid4()}.{_extension(filename)}"
+
+
+def content_addressed_key(user_id: str, content_hash: str, filename: Optional[str]) -> str:
+    """내용 해시로 S3 키 생성 - 같은 이미지는 같은 키 (images/{user_id}/{sha256}.{확장자})"""
+    return f"images/{user_id}/{content_hash}.{_extension(filename)}"
+
+
+def content_hash_from_key(image_key: Optional[str]) -> Optional[str]:
+    """내용 해시로 이름 붙인 키면 해시 반환 (UUID 키 등 이전 방식이면 None)"""
+    if not image_key:
+        return None
+    stem, _ = posixpath.splitext(posixpath.basename(image_key))
+    return stem if _CONTENT_HASH_PATTERN.match(stem) else None
+
+
+def image_url_to_key(image_url: Optional[str]) -> Optional[str]:
+    """업로드 버킷의 Public URL에서 S3 객체 키 추출 (다른 버킷/외부 URL이면 None)"""
+    if not image_url:
+        return None
+    parsed = urlparse(image_url)
+    if not parsed.netloc.startswith(f"{IMAGE_BUCKET_NAME}.s3."):
+        return None
+    return parsed.path.lstrip('/') or None
+
+
+def derivative_key(image_key: str, name: str) -> str:
+    """원본 키에서 파생본 키 계산 (images/u/abc.png -> images/u/abc.thumb.webp)"""
+    stem, _ = posixpath.splitext(image_key)
+    return f"{stem}.{name}.{DERIVATIVES[name].extension}"
+
+
+def derivative_keys(image_key: str) -> list:
+    """원본 키의 모든 파생본 키"""
+    return [derivative_key(image_key, name) for name in DERIVATIVES]
+
+
+def render_derivatives(data: bytes) -> Dict[str, Tuple[bytes, str]]:
+    """원본 이미지 바이트로 파생본 생성 -> {이름: (바이트, Content-Type)}
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 유지합니다.
+    AVIF 인코더는 pillow-avif-plugin(requirements.txt)이 등록하며,
+    그래도 Pillow가 지원하지 않는 포맷은 건너뜁니다.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        import pillow_avif  # noqa: F401  AVIF 인코더 등록
+    except ImportError:
+        print("⚠️ pillow-avif-plugin 미설치: AVIF 파생본 생략")
+    Image.init()  # 포맷 플러그인 등록 (Image.SAVE 채우기)
+
+    with Image.open(io.BytesIO(data)) as source:
+        # 휴대폰 촬영 이미지의 EXIF 회전 반영
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        rendered = {}
+        resized_by_width = {}
+        for name, spec in DERIVATIVES.items():
+            if spec.format not in Image.SAVE:
+                continue
+
+            resized = resized_by_width.get(spec.max_width)
+            if resized is None:
+                resized = image.copy()
+                resized.thumbnail((spec.max_width, spec.max_width * 2), Image.Resampling.LANCZOS)
+                resized_by_width[spec.max_width] = resized
+
+            buffer = io.BytesIO()
+            resized.save(buffer, format=spec.format, quality=spec.quality)
+            rendered[name] = (buffer.getvalue(), spec.content_type)
+
+    return rendered
+
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def _create_executor() -> Executor:
+    # Lambda에는 /dev/shm이 없어서 multiprocessing 동기화 객체를 만들 수 없음
+    if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        try:
+            return ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+        except (OSError, NotImplementedError):
+            pass
+    return ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='image')
+
+
+def get_image_executor() -> Executor:
+    """파생본 생성용 풀 (첫 사용 시 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _create_executor()
+    return _executor
+
+
+async def render_derivatives_async(data: bytes) -> Dict[str, Tuple[bytes, str]]:
+    """render_derivatives를 이미지 풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_executor(), render_derivatives, data)
@@ -0,0 +1,307 @@
+"""
+Subject domain jobs - ARQ 백그라운드 작업 (AI 교정, 노트 생성, 이미지 파생본, 과목 삭제)
+
+API는 작업을 큐에 넣고 job_id를 반환하며, 워커(src/worker.py)가 실행합니다.
+- 같은 입력은 같은 job_id (결과 보관 기간 동안 다시 실행하지 않음, 실패한 작업은 다시 등록 가능)
+- 실패하면 지수 백오프로 재시도 (4xx 오류는 재시도하지 않음)
+- 진행 이벤트는 Redis Stream(job-events:{job_id})에 기록하고 SSE로 전달
+  (재시도한 작업은 text 이벤트를 처음부터 다시 기록하므로, 클라이언트는 retry 이벤트를 받으면
+  지금까지 받은 텍스트를 버리고 새 attempt의 text 이벤트만 이어 붙임)
+- REDIS_URL이 없으면 작업 API는 503 (워커는 API와 별도로 실행, README 참고)
+"""
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Annotated, Any, AsyncGenerator, Awaitable, Callable, Dict, Optional, Tuple
+
+from arq import Retry, create_pool
+from arq.connections import ArqRedis, RedisSettings
+from arq.jobs import Job, JobResult, JobStatus, result_key_prefix
+from fastapi import Depends, HTTPException, status
+
+from ...core.config import settings
+from .service import (
+    CORRECTION_MODEL_ID,
+    CORRECTION_PROMPT_VERSION,
+    NOTE_PROMPT_VERSION,
+    DocumentService,
+    get_document_service,
+    get_subject_service,
+)
+
+CORRECTION_JOB = 'correct_text_job'
+NOTE_JOB = 'generate_note_job'
+DERIVATIVES_JOB = 'image_derivatives_job'
+SUBJECT_DELETION_JOB = 'delete_subject_job'
+
+EVENTS_KEY_PREFIX = 'job-events:'
+TERMINAL_EVENTS = ('done', 'failed')
+
+# 이벤트가 없을 때 작업 상태를 다시 확인하는 간격 (밀리초)
+EVENTS_POLL_MS = 1000
+
+
+class JobError(Exception):
+    """재시도하지 않는 작업 실패 (결과로 저장되므로 pickle 가능한 인자만 사용)"""
+
+    def __init__(self, detail: str, status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR):
+        super().__init__(detail, status_code)
+        self.detail = detail
+        self.status_code = status_code
+
+    def __str__(self) -> str:
+        return self.detail
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+
+def correction_job_id(user_id: str, document_id: str, original_text: str) -> str:
+    """AI 교정 작업 ID (같은 문서/원문/프롬프트 버전이면 같은 ID)"""
+    return f"correction:{_digest(user_id, document_id, CORRECTION_MODEL_ID, CORRECTION_PROMPT_VERSION, original_text)}"
+
+
+def note_job_id(user_id: str, document_id: str, original_text: str) -> str:
+    """노트 생성 작업 ID"""
+    return f"note:{_digest(user_id, document_id, CORRECTION_MODEL_ID, NOTE_PROMPT_VERSION, original_text)}"
+
+
+def derivatives_job_id(image_url: str) -> str:
+    """이미지 파생본 작업 ID"""
+    return f"derivatives:{_digest(image_url)}"
+
+
+def subject_deletion_job_id(user_id: str, subject_id: str) -> str:
+    """과목 삭제 작업 ID (같은 과목이면 같은 ID - 진행 중인 삭제를 다시 등록하지 않음)"""
+    return f"subject-deletion:{_digest(user_id, subject_id)}"
+
+
+# Redis 연결
+
+_pool: Optional[ArqRedis] = None
+_pool_lock = asyncio.Lock()
+
+
+def redis_settings() -> RedisSettings:
+    """ARQ Redis 설정 (REDIS_URL이 없으면 로컬 Redis)"""
+    return RedisSettings.from_dsn(settings.REDIS_URL or 'redis://localhost:6379')
+
+
+async def get_job_pool() -> ArqRedis:
+    """작업 큐 Redis 풀 의존성 (첫 사용 시 연결, REDIS_URL이 없으면 503)"""
+    global _pool
+    if not settings.REDIS_URL:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="작업 큐가 설정되지 않았습니다"
+        )
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                try:
+                    _pool = await create_pool(redis_settings())
+                except Exception as e:
+                    print(f"작업 큐 연결 실패: {str(e)}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="작업 큐에 연결할 수 없습니다"
+                    )
+    return _pool
+
+
+JobPoolDep = Annotated[ArqRedis, Depends(get_job_pool)]
+
+
+# 진행 이벤트
+
+async def publish_event(redis: ArqRedis, job_id: str, event: Dict[str, Any]) -> None:
+    """작업 진행 이벤트 기록 (결과와 같은 기간 보관)"""
+    key = EVENTS_KEY_PREFIX + job_id
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.xadd(key, {'data': json.dumps(event, ensure_ascii=False)})
+        pipe.expire(key, settings.JOB_RESULT_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def stream_job_events(redis: ArqRedis, job_id: str, last_event_id: Optional[str] = None) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+    """작업 이벤트를 (이벤트 ID, 이벤트) 순서대로 전달 (종료 이벤트 또는 연결 시간 제한까지)
+
+    last_event_id 이후부터 이어서 읽으므로 클라이언트는 Last-Event-ID로 재연결하면 됩니다.
+    """
+    key = EVENTS_KEY_PREFIX + job_id
+    cursor = last_event_id or '0-0'
+    deadline = time.monotonic() + settings.JOB_EVENTS_MAX_SECONDS
+    while time.monotonic() < deadline:
+        response = await redis.xread({key: cursor}, count=100, block=EVENTS_POLL_MS)
+        if not response:
+            # 이벤트 없이 끝난 작업 (이벤트 만료, 다른 버전 워커 등)
+            job_status = await Job(job_id, redis).status()
+            if job_status in (JobStatus.complete, JobStatus.not_found):
+                yield cursor, {'type': 'done' if job_status == JobStatus.complete else 'failed', 'status': job_status.value}
+                return
+            continue
+
+        for _, entries in response:
+            for entry_id, fields in entries:
+                cursor = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                event = json.loads(fields[b'data'] if b'data' in fields else fields['data'])
+                yield cursor, event
+                if event.get('type') in TERMINAL_EVENTS:
+                    return
+
+
+# 등록/조회
+
+async def enqueue_job(redis: ArqRedis, function: str, job_id: str, *args: Any) -> str:
+    """작업 등록 (같은 job_id가 대기/실행 중이거나 성공 결과가 있으면 기존 작업 사용)"""
+    job = await redis.enqueue_job(function, *args, _job_id=job_id)
+    if job is not None:
+        return job_id
+
+    # 실패한 결과가 남아 있으면 지우고 다시 등록
+    existing = Job(job_id, redis)
+    if await existing.status() == JobStatus.complete:
+        result = await existing.result_info()
+        if result is not None and not result.success:
+            await redis.delete(result_key_prefix + job_id, EVENTS_KEY_PREFIX + job_id)
+            await redis.enqueue_job(function, *args, _job_id=job_id)
+    return job_id
+
+
+async def get_job_state(redis: ArqRedis, user_id: str, job_id: str) -> Dict[str, Any]:
+    """작업 상태 조회 (다른 사용자의 작업은 404)"""
+    job = Job(job_id, redis)
+    info = await job.info()
+    # 모든 작업의 첫 번째 인자는 user_id
+    if info is None or not info.args or info.args[0] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="작업을 찾을 수 없습니다"
+        )
+
+    state: Dict[str, Any] = {
+        "job_id": job_id,
+        "function": info.function,
+        "status": (await job.status()).value,
+        "attempts": info.job_try or 0,
+        "enqueued_at": info.enqueue_time,
+        "finished_at": None,
+        "success": None,
+        "error": None,
+        "error_status_code": None,
+        "result": None,
+    }
+    if isinstance(info, JobResult):
+        state["finished_at"] = info.finish_time
+        state["success"] = info.success
+        if info.success:
+            state["result"] = info.result
+        else:
+            state["error"] = str(info.result)
+            state["error_status_code"] = getattr(info.result, 'status_code', status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return state
+
+
+async def dispatch_image_derivatives(user_id: str, image_url: str, service: DocumentService) -> None:
+    """이미지 파생본 생성을 작업 큐에 등록 (큐가 없거나 등록 실패 시 현재 프로세스에서 생성)"""
+    if settings.REDIS_URL:
+        try:
+            redis = await get_job_pool()
+            await enqueue_job(redis, DERIVATIVES_JOB, derivatives_job_id(image_url), user_id, image_url)
+            return
+        except Exception as e:
+            print(f"파생본 작업 등록 실패, 직접 생성: {str(e)}")
+    await service.create_image_derivatives(image_url)
+
+
+async def dispatch_subject_deletion(user_id: str, subject_id: str, delete_images: bool) -> bool:
+    """과목 삭제를 작업 큐에 등록 (큐가 없거나 등록 실패 시 False - 호출한 쪽에서 현재 프로세스로 삭제)"""
+    if not settings.REDIS_URL:
+        return False
+    try:
+        redis = await get_job_pool()
+        await enqueue_job(
+            redis, SUBJECT_DELETION_JOB, subject_deletion_job_id(user_id, subject_id),
+            user_id, subject_id, delete_images,
+        )
+        return True
+    except Exception as e:
+        print(f"과목 삭제 작업 등록 실패, 직접 삭제: {str(e)}")
+        return False
+
+
+# 워커 작업 (src/worker.py의 WorkerSettings.functions에 등록)
+
+async def _run(ctx: Dict[str, Any], work: Callable[[], Awaitable[Any]]) -> Any:
+    """작업 실행 + 진행 이벤트 + 백오프 재시도"""
+    redis: ArqRedis = ctx['redis']
+    job_id: str = ctx['job_id']
+    job_try: int = ctx.get('job_try', 1)
+
+    await publish_event(redis, job_id, {'type': 'started', 'attempt': job_try})
+    try:
+        result = await work()
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        status_code = e.status_code if isinstance(e, HTTPException) else status.HTTP_500_INTERNAL_SERVER_ERROR
+        if status_code >= 500 and job_try < settings.JOB_MAX_TRIES:
+            defer = settings.JOB_RETRY_BASE_SECONDS * 2 ** (job_try - 1)
+            print(f"작업 재시도 예정 ({job_id}, {job_try}회 실패, {defer}초 후): {detail}")
+            await publish_event(redis, job_id, {'type': 'retry', 'attempt': job_try, 'error': detail, 'defer': defer})
+            raise Retry(defer=defer)
+        print(f"작업 실패 ({job_id}): {detail}")
+        await publish_event(redis, job_id, {'type': 'failed', 'error': detail, 'status_code': status_code})
+        raise JobError(detail, status_code)
+
+    await publish_event(redis, job_id, {'type': 'done'})
+    return result
+
+
+async def correct_text_job(ctx: Dict[str, Any], user_id: str, document_id: str, original_text: str) -> dict:
+    """AI 텍스트 교정 작업"""
+    service = get_document_service()
+    return await _run(ctx, lambda: service.ai_text_correction(user_id, document_id, original_text))
+
+
+async def generate_note_job(ctx: Dict[str, Any], user_id: str, document_id: str, original_text: str) -> dict:
+    """스마트 노트 생성 작업 (생성되는 텍스트를 attempt 번호와 함께 text 이벤트로 기록)"""
+    service = get_document_service()
+    attempt = ctx.get('job_try', 1)
+
+    async def generate() -> dict:
+        note = ""
+        async for text_chunk in service.generate_note(user_id, document_id, original_text):
+            note += text_chunk
+            await publish_event(ctx['redis'], ctx['job_id'], {'type': 'text', 'attempt': attempt, 'text': text_chunk})
+        return {
+            "original_text": original_text,
+            "note": note,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    return await _run(ctx, generate)
+
+
+async def image_derivatives_job(ctx: Dict[str, Any], user_id: str, image_url: str) -> Dict[str, str]:
+    """이미지 파생본(썸네일, WebP/AVIF) 생성 작업"""
+    service = get_document_service()
+    return await _run(ctx, lambda: service.create_image_derivatives(image_url, raise_errors=True))
+
+
+async def delete_subject_job(ctx: Dict[str, Any], user_id: str, subject_id: str, delete_images: bool) -> dict:
+    """과목 일괄 삭제 작업 (진행 상황은 과목의 deletion_status/deleted_documents에 기록)
+
+    삭제는 문서 단위로 이어서 할 수 있으므로, 재시도는 남은 문서부터 처리합니다.
+    """
+    service = get_subject_service()
+
+    async def delete() -> dict:
+        if ctx.get('job_try', 1) > 1:
+            await service.resume_subject_deletion(user_id, subject_id)
+        await service.delete_subject(user_id, subject_id, delete_images=delete_images, track_progress=True)
+        return {"subject_id": subject_id, "status": "COMPLETED"}
+
+    return await _run(ctx, delete)
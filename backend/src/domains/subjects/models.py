@@ -1,7 +1,9 @@
 """
 Subject domain models for DynamoDB - 과목 및 문서 관리
 """
+import json
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 from uuid import uuid4
 
@@ -26,6 +28,10 @@ class Subject(BaseModel):
     total_documents: int = Field(default=0)
     total_pages: int = Field(default=0)
     
+    # Cascade delete progress (백그라운드 삭제 진행 상황)
+    deletion_status: Optional[str] = None  # 'IN_PROGRESS', 'FAILED'
+    deleted_documents: int = Field(default=0)
+    
     # Timestamps
     created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -50,6 +56,51 @@ class Subject(BaseModel):
         return cls(**item)
 
 
+class StoredImage(BaseModel):
+    """업로드 이미지 - 내용 해시 인덱스 + 문서 참조 수 (SubjectsTable, 사용자 파티션)"""
+    
+    # DynamoDB Keys
+    PK: str = Field(default="", description="Partition Key: USER#{user_id}")
+    SK: str = Field(default="", description="Sort Key: IMAGE#{content_hash}")
+    
+    # Attributes
+    user_id: str
+    content_hash: str  # SHA-256 hex
+    image_key: str  # S3 객체 키
+    content_type: str
+    size: int
+    ref_count: int = Field(default=0)  # 이 이미지를 image_url로 가진 문서 수
+    
+    # Timestamps
+    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    
+    # Type for queries
+    entity_type: str = Field(default="IMAGE")
+    
+    def to_dynamodb_item(self) -> dict:
+        """Convert to DynamoDB item format"""
+        self.PK = f"USER#{self.user_id}"
+        self.SK = f"IMAGE#{self.content_hash}"
+        # user_id는 PK에서 복원 (저장하면 과목 UserIndex에 불필요하게 복제됨)
+        return self.model_dump(exclude={'user_id'})
+    
+    @classmethod
+    def from_dynamodb_item(cls, item: dict) -> "StoredImage":
+        """Create from DynamoDB item"""
+        return cls(user_id=item['PK'].removeprefix('USER#'), **item)
+
+
+class ReviewSnapshot(BaseModel):
+    """복습 완료 직전 상태 - 완료 취소 시 복원용"""
+    
+    ease_factor: float = 2.5
+    repetitions: int = 0
+    interval_days: int = 0
+    review_count: int = 0
+    last_reviewed_at: Optional[str] = None
+    next_review_at: Optional[str] = None
+
+
 class Document(BaseModel):
     """문서 모델 - DynamoDB"""
     
@@ -77,7 +128,13 @@ class Document(BaseModel):
     review_count: int = Field(default=0)
     review_completed: bool = Field(default=False)
     last_reviewed_at: Optional[str] = None
-    next_review_at: Optional[str] = None
+    next_review_at: Optional[str] = None  # 복습 예정 시각 (ReviewIndex 정렬 키, 복습 대상이 아니면 없음)
+    
+    # Spaced repetition (SM-2) state
+    ease_factor: float = Field(default=2.5)
+    repetitions: int = Field(default=0)
+    interval_days: int = Field(default=0)  # SM-2 원래 간격 (modifier/최대 간격 적용 전)
+    previous_review: Optional[ReviewSnapshot] = None  # 복습 완료 취소용 직전 복습 상태
     
     # Timestamps
     created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -95,9 +152,46 @@ class Document(BaseModel):
         """Convert to DynamoDB item format"""
         self.PK = f"SUBJECT#{self.subject_id}"
         self.SK = f"DOCUMENT#{self.document_id}"
-        return self.model_dump()
+        # None은 저장하지 않음 (GSI 키 속성에 NULL 타입을 쓸 수 없고, sparse 인덱스는 속성 부재로 제외됨)
+        item = self.model_dump(exclude_none=True)
+        # DynamoDB는 float를 받지 않으므로 Decimal로 변환
+        return json.loads(json.dumps(item), parse_float=Decimal)
     
     @classmethod
     def from_dynamodb_item(cls, item: dict) -> "Document":
         """Create from DynamoDB item"""
         return cls(**item)
+
+
+class DocumentSummary(BaseModel):
+    """문서 요약 모델 - 목록/복습 화면용 (extracted_text 등 본문 제외)
+    
+    필드를 추가하면 serverless.yml ReviewIndex의 NonKeyAttributes에도 추가해야 함
+    """
+    
+    document_id: str
+    subject_id: str
+    user_id: str
+    title: str
+    pages: int = Field(default=1, ge=1)
+    
+    thumbnail_url: Optional[str] = None
+    
+    review_count: int = Field(default=0)
+    review_completed: bool = Field(default=False)
+    last_reviewed_at: Optional[str] = None
+    next_review_at: Optional[str] = None
+    
+    created_at: str
+    updated_at: str
+    
+    @classmethod
+    def projection(cls) -> tuple[str, dict]:
+        """DynamoDB ProjectionExpression과 ExpressionAttributeNames (예약어 충돌 방지용 별칭)"""
+        names = {f"#{field}": field for field in cls.model_fields}
+        return ", ".join(names), names
+    
+    @classmethod
+    def from_dynamodb_item(cls, item: dict) -> "DocumentSummary":
+        """Create from projected DynamoDB item"""
+        return cls(**item)
@@ -1,28 +1,100 @@
 """
 Subject domain repository - DynamoDB data access layer
 """
+import asyncio
+import base64
+import binascii
+import functools
+import json
 import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
 
-import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
-from .models import Document, Subject
-
-# DynamoDB 리소스 초기화
-dynamodb = boto3.resource('dynamodb', region_name=os.getenv('APP_AWS_REGION', os.getenv('AWS_REGION', 'us-east-1')))
+from ...core.config import settings
+from ...core.dynamodb import DynamoDBProvider, dynamodb_provider
+from .images import content_hash_from_key, image_url_to_key
+from .models import Document, DocumentSummary, StoredImage, Subject
 
 SUBJECTS_TABLE = os.getenv('SUBJECTS_TABLE', 'ocr-test-subjects-dev')
 DOCUMENTS_TABLE = os.getenv('DOCUMENTS_TABLE', 'ocr-test-documents-dev')
 
+# BatchWriteItem 한 번에 보낼 수 있는 최대 항목 수
+BATCH_WRITE_SIZE = 25
+
+# 블로킹 boto3 호출을 이벤트 루프 밖에서 실행하기 위한 전용 스레드 풀
+# (스레드마다 자기 DynamoDB 리소스를 사용, core/dynamodb.py)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+    thread_name_prefix='dynamodb',
+)
+
+T = TypeVar('T')
+
+
+async def run_in_dynamodb_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """블로킹 DynamoDB 호출을 전용 스레드 풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def encode_cursor(last_evaluated_key: Optional[dict]) -> Optional[str]:
+    """LastEvaluatedKey를 클라이언트에 넘길 불투명 커서 문자열로 변환"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """커서 문자열을 ExclusiveStartKey로 복원 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+
+    if not isinstance(key, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in key.items()):
+        raise ValueError("잘못된 커서입니다.")
+    return key
+
+
+def query_all(table, **query_kwargs) -> List[dict]:
+    """LastEvaluatedKey를 따라가며 쿼리 결과 전체 조회 (1MB 응답 제한으로 잘리지 않도록)"""
+    items = []
+    while True:
+        response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return items
+        query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+
+def query_page(table, limit: int, cursor: Optional[str] = None, **query_kwargs) -> Tuple[List[dict], Optional[str]]:
+    """쿼리 결과 한 페이지 조회 - (items, next_cursor) 반환"""
+    if cursor:
+        query_kwargs['ExclusiveStartKey'] = decode_cursor(cursor)
+
+    response = table.query(Limit=limit, **query_kwargs)
+    return response.get('Items', []), encode_cursor(response.get('LastEvaluatedKey'))
+
 
 class SubjectRepository:
     """과목 Repository - DynamoDB 데이터 액세스"""
     
-    def __init__(self):
-        self.table = dynamodb.Table(SUBJECTS_TABLE)
+    def __init__(self, db: DynamoDBProvider = dynamodb_provider):
+        self.db = db
+
+    @property
+    def table(self):
+        """현재 스레드의 테이블 객체 (boto3 리소스는 스레드 간 공유 불가)"""
+        return self.db.table(SUBJECTS_TABLE)
     
     def create(self, subject: Subject) -> Subject:
         """과목 생성"""
@@ -49,26 +121,116 @@ class SubjectRepository:
     def get_by_user(self, user_id: str) -> List[Subject]:
         """사용자의 모든 과목 조회"""
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
                 IndexName='UserIndex',
                 KeyConditionExpression=Key('user_id').eq(user_id) & Key('SK').begins_with('SUBJECT#')
             )
-            items = response.get('Items', [])
             return [Subject.from_dynamodb_item(item) for item in items]
         except ClientError as e:
             raise Exception(f"과목 목록 조회 실패: {e.response['Error']['Message']}")
     
     def update(self, subject: Subject) -> Subject:
-        """과목 정보 수정"""
+        """과목 정보 수정 (통계 카운터는 문서 쓰기에서 원자적으로 관리하므로 덮어쓰지 않음)"""
         subject.updated_at = datetime.utcnow().isoformat()
-        item = subject.to_dynamodb_item()
         
         try:
-            self.table.put_item(Item=item)
+            self.table.update_item(
+                Key={'PK': f"USER#{subject.user_id}", 'SK': f"SUBJECT#{subject.subject_id}"},
+                UpdateExpression='SET #name = :name, color = :color, description = :description, updated_at = :updated_at',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeNames={'#name': 'name'},
+                ExpressionAttributeValues={
+                    ':name': subject.name,
+                    ':color': subject.color,
+                    ':description': subject.description,
+                    ':updated_at': subject.updated_at,
+                }
+            )
             return subject
         except ClientError as e:
             raise Exception(f"과목 수정 실패: {e.response['Error']['Message']}")
     
+    def set_statistics(
+        self, user_id: str, subject_id: str,
+        total_documents: int, total_pages: int,
+        expected_documents: int, expected_pages: int
+    ) -> bool:
+        """통계 카운터 보정 - 읽은 이후 다른 쓰기로 값이 바뀌었으면 덮어쓰지 않고 False 반환"""
+        try:
+            self.table.update_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"SUBJECT#{subject_id}"},
+                UpdateExpression='SET total_documents = :docs, total_pages = :pages',
+                ConditionExpression='total_documents = :expected_docs AND total_pages = :expected_pages',
+                ExpressionAttributeValues={
+                    ':docs': total_documents,
+                    ':pages': total_pages,
+                    ':expected_docs': expected_documents,
+                    ':expected_pages': expected_pages,
+                }
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise Exception(f"과목 통계 보정 실패: {e.response['Error']['Message']}")
+    
+    def mark_deleting(self, user_id: str, subject_id: str) -> None:
+        """백그라운드 삭제 시작 표시 (진행 상황 초기화)"""
+        self._set_deletion_status(user_id, subject_id, 'IN_PROGRESS', reset_progress=True)
+    
+    def mark_deletion_failed(self, user_id: str, subject_id: str) -> None:
+        """백그라운드 삭제 실패 표시 (다시 삭제 요청하면 남은 문서부터 이어서 삭제)"""
+        self._set_deletion_status(user_id, subject_id, 'FAILED')
+    
+    def mark_deletion_resumed(self, user_id: str, subject_id: str) -> None:
+        """실패한 백그라운드 삭제 재시도 표시 (진행 상황 유지 - 남은 문서부터 이어서 삭제)"""
+        self._set_deletion_status(user_id, subject_id, 'IN_PROGRESS')
+    
+    def _set_deletion_status(self, user_id: str, subject_id: str, deletion_status: str, reset_progress: bool = False) -> None:
+        update_expression = 'SET deletion_status = :status'
+        values = {':status': deletion_status}
+        if reset_progress:
+            update_expression += ', deleted_documents = :zero'
+            values[':zero'] = 0
+        
+        try:
+            self.table.update_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"SUBJECT#{subject_id}"},
+                UpdateExpression=update_expression,
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues=values
+            )
+        except ClientError as e:
+            raise Exception(f"과목 삭제 상태 변경 실패: {e.response['Error']['Message']}")
+    
+    def add_deleted_documents(self, user_id: str, subject_id: str, count: int) -> None:
+        """백그라운드 삭제 진행 상황 갱신 (삭제된 문서 수 증가)"""
+        try:
+            self.table.update_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"SUBJECT#{subject_id}"},
+                UpdateExpression='ADD deleted_documents :count',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={':count': count}
+            )
+        except ClientError as e:
+            raise Exception(f"과목 삭제 진행 상황 갱신 실패: {e.response['Error']['Message']}")
+    
+    def scan_all(self) -> List[Subject]:
+        """전체 과목 조회 (오프라인 작업용 - 테이블 전체 스캔)"""
+        try:
+            subjects = []
+            scan_kwargs = {'FilterExpression': Attr('entity_type').eq('SUBJECT')}
+            while True:
+                response = self.table.scan(**scan_kwargs)
+                subjects.extend(Subject.from_dynamodb_item(item) for item in response.get('Items', []))
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key:
+                    return subjects
+                scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
+        except ClientError as e:
+            raise Exception(f"과목 목록 조회 실패: {e.response['Error']['Message']}")
+    
     def delete(self, user_id: str, subject_id: str) -> bool:
         """과목 삭제"""
         pk = f"USER#{user_id}"
@@ -93,18 +255,160 @@ class SubjectRepository:
         return False
 
 
+class ImageRepository:
+    """업로드 이미지 Repository - 내용 해시 인덱스와 참조 수 (SubjectsTable)"""
+    
+    def __init__(self, db: DynamoDBProvider = dynamodb_provider):
+        self.db = db
+
+    @property
+    def table(self):
+        """현재 스레드의 테이블 객체 (boto3 리소스는 스레드 간 공유 불가)"""
+        return self.db.table(SUBJECTS_TABLE)
+    
+    def get(self, user_id: str, content_hash: str) -> Optional[StoredImage]:
+        """내용 해시로 업로드 이미지 조회"""
+        try:
+            response = self.table.get_item(Key={'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"})
+            item = response.get('Item')
+            return StoredImage.from_dynamodb_item(item) if item else None
+        except ClientError as e:
+            raise Exception(f"이미지 조회 실패: {e.response['Error']['Message']}")
+    
+    def create(self, image: StoredImage) -> bool:
+        """업로드 이미지 등록 (같은 해시가 이미 등록되어 있으면 False)"""
+        try:
+            self.table.put_item(Item=image.to_dynamodb_item(), ConditionExpression='attribute_not_exists(PK)')
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise Exception(f"이미지 등록 실패: {e.response['Error']['Message']}")
+    
+    def add_references(self, user_id: str, content_hash: str, delta: int) -> Optional[int]:
+        """참조 수 증감 후 새 참조 수 반환 (등록되지 않은 이미지면 None)"""
+        try:
+            response = self.table.update_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"},
+                UpdateExpression='ADD ref_count :delta',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={':delta': delta},
+                ReturnValues='UPDATED_NEW'
+            )
+            return int(response['Attributes']['ref_count'])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise Exception(f"이미지 참조 수 갱신 실패: {e.response['Error']['Message']}")
+    
+    def delete_if_unreferenced(self, user_id: str, content_hash: str) -> Optional[StoredImage]:
+        """참조하는 문서가 없을 때만 등록 삭제 - 삭제했으면 삭제된 이미지 반환 (S3 객체 정리용)"""
+        try:
+            response = self.table.delete_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"},
+                ConditionExpression='attribute_exists(PK) AND ref_count <= :zero',
+                ExpressionAttributeValues={':zero': 0},
+                ReturnValues='ALL_OLD'
+            )
+            return StoredImage.from_dynamodb_item(response['Attributes'])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise Exception(f"이미지 삭제 실패: {e.response['Error']['Message']}")
+    
+    def scan_unreferenced(self, created_before: str) -> List[StoredImage]:
+        """created_before 이전에 등록됐고 참조하는 문서가 없는 이미지 조회 (오프라인 정리용 - 테이블 전체 스캔)"""
+        try:
+            images = []
+            scan_kwargs = {
+                'FilterExpression': (
+                    Attr('entity_type').eq('IMAGE')
+                    & Attr('ref_count').lte(0)
+                    & Attr('created_at').lt(created_before)
+                ),
+            }
+            while True:
+                response = self.table.scan(**scan_kwargs)
+                images.extend(StoredImage.from_dynamodb_item(item) for item in response.get('Items', []))
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key:
+                    return images
+                scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
+        except ClientError as e:
+            raise Exception(f"이미지 목록 조회 실패: {e.response['Error']['Message']}")
+    
+    def delete_if_stale(self, user_id: str, content_hash: str, created_before: str) -> Optional[StoredImage]:
+        """참조하는 문서가 없고 created_before 이전에 등록된 경우에만 등록 삭제 - 삭제했으면 삭제된 이미지 반환
+
+        업로드 직후 아직 문서가 만들어지지 않은 이미지는 등록 시각 조건으로 보호합니다.
+        """
+        try:
+            response = self.table.delete_item(
+                Key={'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"},
+                ConditionExpression='attribute_exists(PK) AND ref_count <= :zero AND created_at < :cutoff',
+                ExpressionAttributeValues={':zero': 0, ':cutoff': created_before},
+                ReturnValues='ALL_OLD'
+            )
+            return StoredImage.from_dynamodb_item(response['Attributes'])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise Exception(f"이미지 삭제 실패: {e.response['Error']['Message']}")
+
+
 class DocumentRepository:
     """문서 Repository - DynamoDB 데이터 액세스"""
     
-    def __init__(self):
-        self.table = dynamodb.Table(DOCUMENTS_TABLE)
+    def __init__(self, db: DynamoDBProvider = dynamodb_provider):
+        self.db = db
+
+    @property
+    def table(self):
+        """현재 스레드의 테이블 객체 (boto3 리소스는 스레드 간 공유 불가)"""
+        return self.db.table(DOCUMENTS_TABLE)
+    
+    def _subject_counter_update(self, document: Document, documents_delta: int, pages_delta: int) -> dict:
+        """과목 통계 카운터를 원자적으로 증감하는 TransactWriteItems 항목"""
+        return {
+            'Update': {
+                'TableName': SUBJECTS_TABLE,
+                'Key': {'PK': f"USER#{document.user_id}", 'SK': f"SUBJECT#{document.subject_id}"},
+                'UpdateExpression': 'ADD total_documents :docs, total_pages :pages SET updated_at = :updated_at',
+                'ConditionExpression': 'attribute_exists(PK)',
+                'ExpressionAttributeValues': {
+                    ':docs': documents_delta,
+                    ':pages': pages_delta,
+                    ':updated_at': datetime.utcnow().isoformat(),
+                }
+            }
+        }
+    
+    def _image_reference_updates(self, user_id: str, image_url: Optional[str], delta: int) -> List[dict]:
+        """내용 해시로 저장된 이미지면 참조 수를 증감하는 TransactWriteItems 항목 (아니면 빈 목록)"""
+        content_hash = content_hash_from_key(image_url_to_key(image_url))
+        if not content_hash:
+            return []
+        return [{
+            'Update': {
+                'TableName': SUBJECTS_TABLE,
+                'Key': {'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"},
+                'UpdateExpression': 'ADD ref_count :delta',
+                # 등록이 정리된 이미지를 가리키면 트랜잭션 취소 (다시 업로드해야 함)
+                'ConditionExpression': 'attribute_exists(PK)',
+                'ExpressionAttributeValues': {':delta': delta},
+            }
+        }]
     
     def create(self, document: Document) -> Document:
-        """문서 생성"""
+        """문서 생성 (과목 통계 카운터 증가, 이미지 참조 수 증가와 하나의 트랜잭션으로 처리)"""
         item = document.to_dynamodb_item()
         
         try:
-            self.table.put_item(Item=item)
+            self.table.meta.client.transact_write_items(TransactItems=[
+                {'Put': {'TableName': self.table.name, 'Item': item, 'ConditionExpression': 'attribute_not_exists(PK)'}},
+                self._subject_counter_update(document, 1, document.pages),
+                *self._image_reference_updates(document.user_id, document.image_url, 1),
+            ])
             return document
         except ClientError as e:
             raise Exception(f"문서 생성 실패: {e.response['Error']['Message']}")
@@ -121,45 +425,139 @@ class DocumentRepository:
         except ClientError as e:
             raise Exception(f"문서 조회 실패: {e.response['Error']['Message']}")
     
+    def get_by_document_id(self, document_id: str) -> Optional[Document]:
+        """document_id만으로 문서 조회 (DocumentIndex, 단일 읽기)"""
+        try:
+            response = self.table.query(
+                IndexName='DocumentIndex',
+                KeyConditionExpression=Key('document_id').eq(document_id)
+            )
+            items = response.get('Items', [])
+            return Document.from_dynamodb_item(items[0]) if items else None
+        except ClientError as e:
+            raise Exception(f"문서 조회 실패: {e.response['Error']['Message']}")
+    
     def get_by_subject(self, subject_id: str) -> List[Document]:
         """특정 과목의 모든 문서 조회"""
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
                 IndexName='SubjectIndex',
                 KeyConditionExpression=Key('subject_id').eq(subject_id),
                 ScanIndexForward=False  # 최신순 정렬
             )
-            items = response.get('Items', [])
             return [Document.from_dynamodb_item(item) for item in items]
         except ClientError as e:
             raise Exception(f"문서 목록 조회 실패: {e.response['Error']['Message']}")
     
+    def get_summary_page_by_subject(
+        self, subject_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """특정 과목의 문서 요약 한 페이지 조회 (최신순, 본문 제외)"""
+        projection, names = DocumentSummary.projection()
+        try:
+            items, next_cursor = query_page(
+                self.table,
+                limit,
+                cursor,
+                IndexName='SubjectIndex',
+                KeyConditionExpression=Key('subject_id').eq(subject_id),
+                ProjectionExpression=projection,
+                ExpressionAttributeNames=names,
+                ScanIndexForward=False
+            )
+            return [DocumentSummary.from_dynamodb_item(item) for item in items], next_cursor
+        except ClientError as e:
+            raise Exception(f"문서 목록 조회 실패: {e.response['Error']['Message']}")
+    
     def get_by_user(self, user_id: str) -> List[Document]:
         """사용자의 모든 문서 조회"""
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
                 IndexName='UserIndex',
                 KeyConditionExpression=Key('user_id').eq(user_id),
                 ScanIndexForward=False  # 최신순 정렬
             )
-            items = response.get('Items', [])
             return [Document.from_dynamodb_item(item) for item in items]
         except ClientError as e:
             raise Exception(f"문서 목록 조회 실패: {e.response['Error']['Message']}")
     
-    def update(self, document: Document) -> Document:
-        """문서 정보 수정"""
+    def get_summary_page_by_user(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """사용자의 문서 요약 한 페이지 조회 (최신순, 본문 제외)"""
+        projection, names = DocumentSummary.projection()
+        try:
+            items, next_cursor = query_page(
+                self.table,
+                limit,
+                cursor,
+                IndexName='UserIndex',
+                KeyConditionExpression=Key('user_id').eq(user_id),
+                ProjectionExpression=projection,
+                ExpressionAttributeNames=names,
+                ScanIndexForward=False
+            )
+            return [DocumentSummary.from_dynamodb_item(item) for item in items], next_cursor
+        except ClientError as e:
+            raise Exception(f"문서 목록 조회 실패: {e.response['Error']['Message']}")
+    
+    def get_due_summary_page(
+        self, user_id: str, due_until: str, limit: int,
+        cursor: Optional[str] = None, due_from: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """복습 예정 문서 요약 한 페이지 조회 (ReviewIndex, due_from <= next_review_at <= due_until, 최신순)"""
+        projection, names = DocumentSummary.projection()
+        due_condition = (
+            Key('next_review_at').between(due_from, due_until) if due_from
+            else Key('next_review_at').lte(due_until)
+        )
+        try:
+            items, next_cursor = query_page(
+                self.table,
+                limit,
+                cursor,
+                IndexName='ReviewIndex',
+                KeyConditionExpression=Key('user_id').eq(user_id) & due_condition,
+                ProjectionExpression=projection,
+                ExpressionAttributeNames=names,
+                ScanIndexForward=False
+            )
+            return [DocumentSummary.from_dynamodb_item(item) for item in items], next_cursor
+        except ClientError as e:
+            raise Exception(f"복습 문서 조회 실패: {e.response['Error']['Message']}")
+    
+    def update(self, document: Document, pages_delta: int = 0, previous_image_url: Optional[str] = None) -> Document:
+        """문서 정보 수정
+
+        페이지 수가 바뀌면 과목 통계 카운터를, 이미지가 바뀌면 (previous_image_url) 이미지 참조 수를
+        같은 트랜잭션으로 증감합니다.
+        """
         document.updated_at = datetime.utcnow().isoformat()
         item = document.to_dynamodb_item()
         
+        related_updates = []
+        if pages_delta:
+            related_updates.append(self._subject_counter_update(document, 0, pages_delta))
+        if previous_image_url != document.image_url:
+            related_updates += self._image_reference_updates(document.user_id, previous_image_url, -1)
+            related_updates += self._image_reference_updates(document.user_id, document.image_url, 1)
+        
         try:
-            self.table.put_item(Item=item)
+            if not related_updates:
+                self.table.put_item(Item=item)
+            else:
+                self.table.meta.client.transact_write_items(TransactItems=[
+                    {'Put': {'TableName': self.table.name, 'Item': item, 'ConditionExpression': 'attribute_exists(PK)'}},
+                    *related_updates,
+                ])
             return document
         except ClientError as e:
             raise Exception(f"문서 수정 실패: {e.response['Error']['Message']}")
     
     def delete(self, subject_id: str, document_id: str) -> bool:
-        """문서 삭제"""
+        """문서 삭제 (과목 통계 카운터는 건드리지 않음 - 과목 일괄 삭제용)"""
         pk = f"SUBJECT#{subject_id}"
         sk = f"DOCUMENT#{document_id}"
         
@@ -169,12 +567,310 @@ class DocumentRepository:
         except ClientError as e:
             raise Exception(f"문서 삭제 실패: {e.response['Error']['Message']}")
     
-    def count_by_subject(self, subject_id: str) -> int:
-        """과목별 문서 수 카운트"""
-        documents = self.get_by_subject(subject_id)
-        return len(documents)
+    def delete_with_counters(self, document: Document) -> bool:
+        """문서 삭제 (과목 통계 카운터 감소, 이미지 참조 수 감소와 하나의 트랜잭션으로 처리)"""
+        try:
+            self.table.meta.client.transact_write_items(TransactItems=[
+                {
+                    'Delete': {
+                        'TableName': self.table.name,
+                        'Key': {'PK': f"SUBJECT#{document.subject_id}", 'SK': f"DOCUMENT#{document.document_id}"},
+                        # 이미 삭제된 문서면 카운터를 두 번 감소시키지 않도록 트랜잭션 취소
+                        'ConditionExpression': 'attribute_exists(PK)',
+                    }
+                },
+                self._subject_counter_update(document, -1, -document.pages),
+                *self._image_reference_updates(document.user_id, document.image_url, -1),
+            ])
+            return True
+        except ClientError as e:
+            raise Exception(f"문서 삭제 실패: {e.response['Error']['Message']}")
+    
+    def batch_delete(self, keys: List[dict], max_attempts: int = 5) -> int:
+        """BatchWriteItem으로 최대 25개 문서 삭제 - UnprocessedItems는 지수 백오프로 재시도"""
+        if len(keys) > BATCH_WRITE_SIZE:
+            raise ValueError(f"BatchWriteItem은 최대 {BATCH_WRITE_SIZE}개까지 처리할 수 있습니다.")
+        
+        request_items = {self.table.name: [{'DeleteRequest': {'Key': key}} for key in keys]}
+        
+        try:
+            for attempt in range(max_attempts):
+                response = self.table.meta.client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems') or {}
+                if not request_items:
+                    return len(keys)
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        except ClientError as e:
+            raise Exception(f"문서 일괄 삭제 실패: {e.response['Error']['Message']}")
+        
+        raise Exception("문서 일괄 삭제 실패: 재시도 후에도 처리되지 않은 문서가 남아 있습니다.")
     
-    def sum_pages_by_subject(self, subject_id: str) -> int:
-        """과목별 총 페이지 수 계산"""
-        documents = self.get_by_subject(subject_id)
-        return sum(doc.pages for doc in documents)
+    def delete_releasing_images(self, user_id: str, items: List[dict]) -> int:
+        """최대 25개 문서 삭제 + 이미지 참조 수 감소를 하나의 트랜잭션으로 처리 (과목 일괄 삭제용)
+
+        items는 get_keys_by_subject 결과 (PK, SK, image_url). 문서가 지워지면 그 참조도 함께
+        감소하므로, 중간에 실패한 과목 삭제를 다시 실행해도 남은 문서만 처리됩니다.
+        """
+        if len(items) > BATCH_WRITE_SIZE:
+            raise ValueError(f"한 번에 최대 {BATCH_WRITE_SIZE}개까지 처리할 수 있습니다.")
+        
+        references = Counter(filter(None, (
+            content_hash_from_key(image_url_to_key(item.get('image_url'))) for item in items
+        )))
+        transact_items = [self._delete_existing(item) for item in items] + [
+            {
+                'Update': {
+                    'TableName': SUBJECTS_TABLE,
+                    'Key': {'PK': f"USER#{user_id}", 'SK': f"IMAGE#{content_hash}"},
+                    'UpdateExpression': 'ADD ref_count :delta',
+                    'ConditionExpression': 'attribute_exists(PK)',
+                    'ExpressionAttributeValues': {':delta': -count},
+                }
+            }
+            for content_hash, count in references.items()
+        ]
+        
+        try:
+            self.table.meta.client.transact_write_items(TransactItems=transact_items)
+            return len(items)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise Exception(f"문서 일괄 삭제 실패: {e.response['Error']['Message']}")
+        
+        # 이미 삭제된 문서(인덱스 지연)나 등록이 정리된 이미지가 섞여 있으면 문서별로 처리
+        return sum(self._delete_releasing_image(user_id, item) for item in items)
+    
+    def _delete_existing(self, item: dict) -> dict:
+        """문서가 남아 있을 때만 삭제하는 TransactWriteItems 항목"""
+        return {
+            'Delete': {
+                'TableName': self.table.name,
+                'Key': {'PK': item['PK'], 'SK': item['SK']},
+                # 이미 삭제된 문서면 참조 수를 두 번 감소시키지 않도록 트랜잭션 취소
+                'ConditionExpression': 'attribute_exists(PK)',
+            }
+        }
+    
+    def _delete_releasing_image(self, user_id: str, item: dict) -> bool:
+        """문서 하나 삭제 + 이미지 참조 수 감소 (이미 삭제된 문서면 False)"""
+        updates = self._image_reference_updates(user_id, item.get('image_url'), -1)
+        try:
+            self.table.meta.client.transact_write_items(TransactItems=[self._delete_existing(item), *updates])
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise Exception(f"문서 삭제 실패: {e.response['Error']['Message']}")
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if reasons[:1] == ['ConditionalCheckFailed']:
+                return False
+            if not (updates and reasons[1:2] == ['ConditionalCheckFailed']):
+                raise Exception(f"문서 삭제 실패: {e.response['Error']['Message']}")
+        
+        # 이미지 등록이 이미 정리됨 - 감소할 참조 없이 문서만 삭제
+        return self.delete(item['PK'].removeprefix('SUBJECT#'), item['SK'].removeprefix('DOCUMENT#'))
+    
+    def get_keys_by_subject(self, subject_id: str) -> List[dict]:
+        """특정 과목의 모든 문서 키 + image_url 조회 (일괄 삭제용, 본문은 읽지 않음)"""
+        try:
+            return query_all(
+                self.table,
+                IndexName='SubjectIndex',
+                KeyConditionExpression=Key('subject_id').eq(subject_id),
+                ProjectionExpression='PK, SK, image_url'
+            )
+        except ClientError as e:
+            raise Exception(f"문서 목록 조회 실패: {e.response['Error']['Message']}")
+    
+    def get_statistics_by_subject(self, subject_id: str) -> Tuple[int, int]:
+        """과목별 (문서 수, 총 페이지 수) 재계산 - 통계 보정용"""
+        try:
+            items = query_all(
+                self.table,
+                IndexName='SubjectIndex',
+                KeyConditionExpression=Key('subject_id').eq(subject_id),
+                ProjectionExpression='pages'
+            )
+            return len(items), sum(int(item.get('pages', 1)) for item in items)
+        except ClientError as e:
+            raise Exception(f"과목 통계 계산 실패: {e.response['Error']['Message']}")
+
+
+class AsyncSubjectRepository:
+    """과목 Repository (async) - SubjectRepository와 동일한 인터페이스, 이벤트 루프를 막지 않음"""
+
+    def __init__(self, repo: Optional[SubjectRepository] = None):
+        self._repo = repo or SubjectRepository()
+
+    async def create(self, subject: Subject) -> Subject:
+        """과목 생성"""
+        return await run_in_dynamodb_pool(self._repo.create, subject)
+
+    async def get_by_id(self, user_id: str, subject_id: str) -> Optional[Subject]:
+        """특정 과목 조회"""
+        return await run_in_dynamodb_pool(self._repo.get_by_id, user_id, subject_id)
+
+    async def get_by_user(self, user_id: str) -> List[Subject]:
+        """사용자의 모든 과목 조회"""
+        return await run_in_dynamodb_pool(self._repo.get_by_user, user_id)
+
+    async def update(self, subject: Subject) -> Subject:
+        """과목 정보 수정"""
+        return await run_in_dynamodb_pool(self._repo.update, subject)
+
+    async def delete(self, user_id: str, subject_id: str) -> bool:
+        """과목 삭제"""
+        return await run_in_dynamodb_pool(self._repo.delete, user_id, subject_id)
+
+    async def check_duplicate_name(self, user_id: str, name: str, exclude_id: Optional[str] = None) -> bool:
+        """과목명 중복 체크"""
+        return await run_in_dynamodb_pool(self._repo.check_duplicate_name, user_id, name, exclude_id)
+
+    async def mark_deleting(self, user_id: str, subject_id: str) -> None:
+        """백그라운드 삭제 시작 표시 (진행 상황 초기화)"""
+        await run_in_dynamodb_pool(self._repo.mark_deleting, user_id, subject_id)
+
+    async def mark_deletion_failed(self, user_id: str, subject_id: str) -> None:
+        """백그라운드 삭제 실패 표시"""
+        await run_in_dynamodb_pool(self._repo.mark_deletion_failed, user_id, subject_id)
+
+    async def mark_deletion_resumed(self, user_id: str, subject_id: str) -> None:
+        """실패한 백그라운드 삭제 재시도 표시 (진행 상황 유지)"""
+        await run_in_dynamodb_pool(self._repo.mark_deletion_resumed, user_id, subject_id)
+
+    async def add_deleted_documents(self, user_id: str, subject_id: str, count: int) -> None:
+        """백그라운드 삭제 진행 상황 갱신 (삭제된 문서 수 증가)"""
+        await run_in_dynamodb_pool(self._repo.add_deleted_documents, user_id, subject_id, count)
+
+
+class AsyncImageRepository:
+    """업로드 이미지 Repository (async) - ImageRepository와 동일한 인터페이스"""
+
+    def __init__(self, repo: Optional[ImageRepository] = None):
+        self._repo = repo or ImageRepository()
+
+    async def get(self, user_id: str, content_hash: str) -> Optional[StoredImage]:
+        """내용 해시로 업로드 이미지 조회"""
+        return await run_in_dynamodb_pool(self._repo.get, user_id, content_hash)
+
+    async def create(self, image: StoredImage) -> bool:
+        """업로드 이미지 등록 (같은 해시가 이미 등록되어 있으면 False)"""
+        return await run_in_dynamodb_pool(self._repo.create, image)
+
+    async def add_references(self, user_id: str, content_hash: str, delta: int) -> Optional[int]:
+        """참조 수 증감 후 새 참조 수 반환 (등록되지 않은 이미지면 None)"""
+        return await run_in_dynamodb_pool(self._repo.add_references, user_id, content_hash, delta)
+
+    async def delete_if_unreferenced(self, user_id: str, content_hash: str) -> Optional[StoredImage]:
+        """참조하는 문서가 없을 때만 등록 삭제 - 삭제했으면 삭제된 이미지 반환"""
+        return await run_in_dynamodb_pool(self._repo.delete_if_unreferenced, user_id, content_hash)
+
+    async def delete_if_stale(self, user_id: str, content_hash: str, created_before: str) -> Optional[StoredImage]:
+        """참조하는 문서가 없고 created_before 이전에 등록된 경우에만 등록 삭제"""
+        return await run_in_dynamodb_pool(self._repo.delete_if_stale, user_id, content_hash, created_before)
+
+
+class AsyncDocumentRepository:
+    """문서 Repository (async) - DocumentRepository와 동일한 인터페이스, 이벤트 루프를 막지 않음"""
+
+    def __init__(self, repo: Optional[DocumentRepository] = None):
+        self._repo = repo or DocumentRepository()
+
+    async def create(self, document: Document) -> Document:
+        """문서 생성"""
+        return await run_in_dynamodb_pool(self._repo.create, document)
+
+    async def get_by_id(self, subject_id: str, document_id: str) -> Optional[Document]:
+        """특정 문서 조회"""
+        return await run_in_dynamodb_pool(self._repo.get_by_id, subject_id, document_id)
+
+    async def get_by_document_id(self, document_id: str) -> Optional[Document]:
+        """document_id만으로 문서 조회 (DocumentIndex, 단일 읽기)"""
+        return await run_in_dynamodb_pool(self._repo.get_by_document_id, document_id)
+
+    async def get_by_subject(self, subject_id: str) -> List[Document]:
+        """특정 과목의 모든 문서 조회"""
+        return await run_in_dynamodb_pool(self._repo.get_by_subject, subject_id)
+
+    async def get_summary_page_by_subject(
+        self, subject_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """특정 과목의 문서 요약 한 페이지 조회 (최신순, 본문 제외)"""
+        return await run_in_dynamodb_pool(self._repo.get_summary_page_by_subject, subject_id, limit, cursor)
+
+    async def get_by_user(self, user_id: str) -> List[Document]:
+        """사용자의 모든 문서 조회"""
+        return await run_in_dynamodb_pool(self._repo.get_by_user, user_id)
+
+    async def get_summary_page_by_user(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """사용자의 문서 요약 한 페이지 조회 (최신순, 본문 제외)"""
+        return await run_in_dynamodb_pool(self._repo.get_summary_page_by_user, user_id, limit, cursor)
+
+    async def get_due_summary_page(
+        self, user_id: str, due_until: str, limit: int,
+        cursor: Optional[str] = None, due_from: Optional[str] = None
+    ) -> Tuple[List[DocumentSummary], Optional[str]]:
+        """복습 예정 문서 요약 한 페이지 조회 (ReviewIndex, due_from <= next_review_at <= due_until)"""
+        return await run_in_dynamodb_pool(
+            self._repo.get_due_summary_page, user_id, due_until, limit, cursor, due_from
+        )
+
+    async def update(self, document: Document, pages_delta: int = 0, previous_image_url: Optional[str] = None) -> Document:
+        """문서 정보 수정 (페이지 수, 이미지가 바뀌면 과목 통계 카운터, 이미지 참조 수도 같은 트랜잭션으로 증감)"""
+        return await run_in_dynamodb_pool(self._repo.update, document, pages_delta, previous_image_url)
+
+    async def delete(self, subject_id: str, document_id: str) -> bool:
+        """문서 삭제 (과목 통계 카운터는 건드리지 않음 - 과목 일괄 삭제용)"""
+        return await run_in_dynamodb_pool(self._repo.delete, subject_id, document_id)
+
+    async def delete_with_counters(self, document: Document) -> bool:
+        """문서 삭제 (과목 통계 카운터 감소, 이미지 참조 수 감소와 하나의 트랜잭션으로 처리)"""
+        return await run_in_dynamodb_pool(self._repo.delete_with_counters, document)
+
+    async def batch_delete(
+        self,
+        keys: List[dict],
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> int:
+        """문서 일괄 삭제 - 25개씩 나눈 BatchWriteItem을 최대 concurrency개 동시에 실행"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def delete_chunk(chunk: List[dict]) -> int:
+            async with semaphore:
+                deleted = await run_in_dynamodb_pool(self._repo.batch_delete, chunk)
+            if on_progress:
+                await on_progress(deleted)
+            return deleted
+
+        chunks = [keys[i:i + BATCH_WRITE_SIZE] for i in range(0, len(keys), BATCH_WRITE_SIZE)]
+        return sum(await asyncio.gather(*(delete_chunk(chunk) for chunk in chunks)))
+
+    async def delete_releasing_images(
+        self,
+        user_id: str,
+        items: List[dict],
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> int:
+        """문서 일괄 삭제 + 이미지 참조 수 감소 - 25개씩 나눈 트랜잭션을 최대 concurrency개 동시에 실행"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def delete_chunk(chunk: List[dict]) -> int:
+            async with semaphore:
+                deleted = await run_in_dynamodb_pool(self._repo.delete_releasing_images, user_id, chunk)
+            if on_progress:
+                await on_progress(deleted)
+            return deleted
+
+        chunks = [items[i:i + BATCH_WRITE_SIZE] for i in range(0, len(items), BATCH_WRITE_SIZE)]
+        return sum(await asyncio.gather(*(delete_chunk(chunk) for chunk in chunks)))
+
+    async def get_keys_by_subject(self, subject_id: str) -> List[dict]:
+        """특정 과목의 모든 문서 키 + image_url 조회 (일괄 삭제용)"""
+        return await run_in_dynamodb_pool(self._repo.get_keys_by_subject, subject_id)
+
+    async def get_statistics_by_subject(self, subject_id: str) -> Tuple[int, int]:
+        """과목별 (문서 수, 총 페이지 수) 재계산 - 통계 보정용"""
+        return await run_in_dynamodb_pool(self._repo.get_statistics_by_subject, subject_id)
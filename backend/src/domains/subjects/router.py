@@ -1,23 +1,46 @@
 """
 Subjects domain router - 과목 및 문서 API (DynamoDB)
 """
-from typing import List
+import asyncio
+import shutil
+import tempfile
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response, status, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import json
 
+from ...core.config import settings
 from ...dependencies import CurrentUser
+from .jobs import (
+    CORRECTION_JOB,
+    NOTE_JOB,
+    JobPoolDep,
+    correction_job_id,
+    dispatch_image_derivatives,
+    dispatch_subject_deletion,
+    enqueue_job,
+    get_job_state,
+    note_job_id,
+    stream_job_events,
+)
 from .schemas import (
     DocumentCreate,
+    DocumentPage,
     DocumentResponse,
     DocumentUpdate,
+    ImageUploadComplete,
+    ImageUploadCompleteResponse,
+    ImageUploadRequest,
+    JobResponse,
+    JobStatusResponse,
+    PresignedUploadResponse,
     SubjectCreate,
     SubjectResponse,
     SubjectUpdate,
 )
-from .service import DocumentService, SubjectService
+from .service import DocumentServiceDep, SubjectServiceDep
 
 
 class TextCorrectionRequest(BaseModel):
@@ -25,6 +48,9 @@ class TextCorrectionRequest(BaseModel):
 
 router = APIRouter()
 
+# 진행 상황 업로드용 사본은 이보다 크면 디스크로 넘김 (Starlette 폼 파싱과 같은 1MB)
+UPLOAD_SPOOL_MAX_SIZE = 1024 * 1024
+
 
 # Subject Endpoints
 
@@ -32,31 +58,44 @@ router = APIRouter()
 async def create_subject(
     subject_data: SubjectCreate,
     current_user: CurrentUser,
+    service: SubjectServiceDep,
 ):
     """과목 생성"""
-    service = SubjectService()
-    subject = service.create_subject(current_user.id, subject_data)
+    subject = await service.create_subject(current_user.id, subject_data)
     return subject
 
 
 @router.get("", response_model=List[SubjectResponse])
 async def get_my_subjects(
     current_user: CurrentUser,
+    service: SubjectServiceDep,
 ):
     """내 과목 목록 조회"""
-    service = SubjectService()
-    subjects = service.get_user_subjects(current_user.id)
+    subjects = await service.get_user_subjects(current_user.id)
     return subjects
 
 
+# /{subject_id} 보다 먼저 등록해야 "reviews"가 subject_id로 매칭되지 않음
+@router.get("/reviews")
+async def get_review_documents(
+    current_user: CurrentUser,
+    service: DocumentServiceDep,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+):
+    """복습 문서 조회 (오늘의 복습, 밀린 복습)"""
+    reviews = await service.get_review_documents(current_user.id, limit, cursor)
+    return reviews
+
+
 @router.get("/{subject_id}", response_model=SubjectResponse)
 async def get_subject_detail(
     subject_id: str,
     current_user: CurrentUser,
+    service: SubjectServiceDep,
 ):
     """과목 상세 조회"""
-    service = SubjectService()
-    subject = service.get_subject_by_id(current_user.id, subject_id)
+    subject = await service.get_subject_by_id(current_user.id, subject_id)
     return subject
 
 
@@ -65,10 +104,10 @@ async def update_subject(
     subject_id: str,
     subject_data: SubjectUpdate,
     current_user: CurrentUser,
+    service: SubjectServiceDep,
 ):
     """과목 정보 수정"""
-    service = SubjectService()
-    subject = service.update_subject(current_user.id, subject_id, subject_data)
+    subject = await service.update_subject(current_user.id, subject_id, subject_data)
     return subject
 
 
@@ -76,10 +115,37 @@ async def update_subject(
 async def delete_subject(
     subject_id: str,
     current_user: CurrentUser,
+    service: SubjectServiceDep,
+    background_tasks: BackgroundTasks,
+    delete_images: bool = Query(False, description="문서가 참조하는 S3 이미지도 함께 삭제"),
+    background: bool = Query(False, description="백그라운드로 삭제하고 202 반환 (진행 상황은 /{subject_id}/deletion 으로 조회)"),
 ):
-    """과목 삭제"""
-    service = SubjectService()
-    service.delete_subject(current_user.id, subject_id)
+    """과목 삭제 (관련 문서 일괄 삭제)
+
+    background=true면 작업 큐(워커)에서 삭제합니다. REDIS_URL이 없거나 등록에 실패하면
+    응답 후 같은 프로세스에서 삭제합니다 (Lambda에서는 같은 호출의 시간 제한을 받음).
+    """
+    if not background:
+        await service.delete_subject(current_user.id, subject_id, delete_images=delete_images)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    progress = await service.start_subject_deletion(current_user.id, subject_id)
+    if not await dispatch_subject_deletion(current_user.id, subject_id, delete_images):
+        background_tasks.add_task(
+            service.delete_subject, current_user.id, subject_id,
+            delete_images=delete_images, track_progress=True,
+        )
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=progress)
+
+
+@router.get("/{subject_id}/deletion")
+async def get_subject_deletion_progress(
+    subject_id: str,
+    current_user: CurrentUser,
+    service: SubjectServiceDep,
+):
+    """백그라운드 과목 삭제 진행 상황 조회"""
+    return await service.get_deletion_progress(current_user.id, subject_id)
 
 
 # Document Endpoints
@@ -88,32 +154,34 @@ async def delete_subject(
 async def create_document(
     document_data: DocumentCreate,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """문서 생성"""
-    service = DocumentService()
-    document = service.create_document(current_user.id, document_data)
+    document = await service.create_document(current_user.id, document_data)
     return document
 
 
-@router.get("/{subject_id}/documents", response_model=List[DocumentResponse])
+@router.get("/{subject_id}/documents", response_model=DocumentPage)
 async def get_subject_documents(
     subject_id: str,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
 ):
-    """특정 과목의 문서 목록 조회"""
-    service = DocumentService()
-    documents = service.get_subject_documents(current_user.id, subject_id)
-    return documents
+    """특정 과목의 문서 목록 조회 (커서 기반 페이지네이션)"""
+    documents, next_cursor = await service.get_subject_documents(current_user.id, subject_id, limit, cursor)
+    return DocumentPage(items=documents, next_cursor=next_cursor)
 
 
 @router.get("/documents/{document_id}", response_model=DocumentResponse)
 async def get_document_detail(
     document_id: str,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """문서 상세 조회"""
-    service = DocumentService()
-    document = service.get_document_by_id(current_user.id, document_id)
+    document = await service.get_document_by_id(current_user.id, document_id)
     return document
 
 
@@ -122,10 +190,10 @@ async def update_document(
     document_id: str,
     document_data: DocumentUpdate,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """문서 정보 수정"""
-    service = DocumentService()
-    document = service.update_document(current_user.id, document_id, document_data)
+    document = await service.update_document(current_user.id, document_id, document_data)
     return document
 
 
@@ -133,41 +201,32 @@ async def update_document(
 async def delete_document(
     document_id: str,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """문서 삭제"""
-    service = DocumentService()
-    service.delete_document(current_user.id, document_id)
+    await service.delete_document(current_user.id, document_id)
 
 
 @router.patch("/documents/{document_id}/review", response_model=DocumentResponse)
 async def toggle_review_status(
     document_id: str,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
+    quality: Optional[int] = Query(None, ge=0, le=5, description="복습 채점 (0: 완전히 잊음 ~ 5: 완벽), 기본 4"),
 ):
-    """문서 복습 완료 상태 토글"""
-    service = DocumentService()
-    document = service.toggle_review_status(current_user.id, document_id)
+    """문서 복습 완료 상태 토글 (완료 시 다음 복습일 자동 계산)"""
+    document = await service.toggle_review_status(current_user.id, document_id, quality)
     return document
 
 
-@router.get("/reviews")
-async def get_review_documents(
-    current_user: CurrentUser,
-):
-    """복습 문서 조회 (오늘의 복습, 밀린 복습)"""
-    service = DocumentService()
-    reviews = service.get_review_documents(current_user.id)
-    return reviews
-
-
 @router.post("/documents/{document_id}/ai-correction")
 async def ai_text_correction(
     document_id: str,
     request: TextCorrectionRequest,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """AI를 사용하여 문서 텍스트 교정"""
-    service = DocumentService()
     result = await service.ai_text_correction(current_user.id, document_id, request.original_text)
     return result
 
@@ -177,10 +236,9 @@ async def ai_text_correction_stream(
     document_id: str,
     request: TextCorrectionRequest,
     current_user: CurrentUser,
+    service: DocumentServiceDep,
 ):
     """AI를 사용하여 문서 텍스트 교정 (스트리밍)"""
-    service = DocumentService()
-
     async def generate():
         async for chunk in service.ai_text_correction_stream(current_user.id, document_id, request.original_text):
             yield f"data: {json.dumps({'text': chunk})}\n\n"
@@ -196,14 +254,187 @@ async def ai_text_correction_stream(
     )
 
 
+# Background Job Endpoints
+
+@router.post("/documents/{document_id}/ai-correction/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_ai_text_correction(
+    document_id: str,
+    request: TextCorrectionRequest,
+    current_user: CurrentUser,
+    service: DocumentServiceDep,
+    redis: JobPoolDep,
+):
+    """AI 텍스트 교정을 백그라운드 작업으로 등록 (같은 원문은 같은 작업)"""
+    await service.get_document_by_id(current_user.id, document_id)
+    job_id = await enqueue_job(
+        redis, CORRECTION_JOB, correction_job_id(current_user.id, document_id, request.original_text),
+        current_user.id, document_id, request.original_text
+    )
+    state = await get_job_state(redis, current_user.id, job_id)
+    return {"job_id": job_id, "status": state["status"]}
+
+
+@router.post("/documents/{document_id}/ai-note/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_ai_note(
+    document_id: str,
+    request: TextCorrectionRequest,
+    current_user: CurrentUser,
+    service: DocumentServiceDep,
+    redis: JobPoolDep,
+):
+    """스마트 노트 생성을 백그라운드 작업으로 등록 (진행 상황은 /jobs/{job_id}/events)"""
+    await service.get_document_by_id(current_user.id, document_id)
+    job_id = await enqueue_job(
+        redis, NOTE_JOB, note_job_id(current_user.id, document_id, request.original_text),
+        current_user.id, document_id, request.original_text
+    )
+    state = await get_job_state(redis, current_user.id, job_id)
+    return {"job_id": job_id, "status": state["status"]}
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    current_user: CurrentUser,
+    redis: JobPoolDep,
+):
+    """백그라운드 작업 상태 조회"""
+    return await get_job_state(redis, current_user.id, job_id)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    current_user: CurrentUser,
+    redis: JobPoolDep,
+):
+    """백그라운드 작업 결과 조회 (완료 전이면 409, 실패했으면 작업의 오류를 그대로 반환)"""
+    state = await get_job_state(redis, current_user.id, job_id)
+    if state["success"] is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"작업이 아직 완료되지 않았습니다 ({state['status']})"
+        )
+    if not state["success"]:
+        raise HTTPException(status_code=state["error_status_code"], detail=state["error"])
+    return state["result"]
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_progress(
+    job_id: str,
+    current_user: CurrentUser,
+    redis: JobPoolDep,
+    last_event_id: Optional[str] = Header(None),
+):
+    """백그라운드 작업 진행 상황 (SSE, 연결이 끊기면 Last-Event-ID로 이어서 수신)
+
+    retry 이벤트 이후에는 노트 텍스트가 처음부터 다시 오므로, 클라이언트는 받은 텍스트를 버리고
+    text 이벤트의 attempt가 마지막 started 이벤트의 attempt와 같은 것만 이어 붙여야 합니다.
+    """
+    await get_job_state(redis, current_user.id, job_id)
+
+    async def generate():
+        async for event_id, event in stream_job_events(redis, job_id, last_event_id):
+            yield f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 # S3 Upload Endpoint
 
 @router.post("/upload-image")
 async def upload_image(
     current_user: CurrentUser,
+    service: DocumentServiceDep,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    progress: bool = Query(False, description="S3 전송 진행 상황을 SSE로 스트리밍 (마지막 이벤트에 image_url)"),
 ):
-    """이미지를 S3에 업로드하고 URL 반환"""
-    service = DocumentService()
-    image_url = await service.upload_image_to_s3(current_user.id, file)
-    return {"image_url": image_url}
+    """이미지를 S3에 업로드하고 URL 반환 (썸네일 등 파생본은 작업 큐 또는 응답 후 생성)"""
+    if not progress:
+        image_url = await service.upload_image_to_s3(current_user.id, file)
+        background_tasks.add_task(dispatch_image_derivatives, current_user.id, image_url, service)
+        return {"image_url": image_url, "thumbnail_url": service.get_thumbnail_url(image_url)}
+
+    # 요청 폼의 파일은 핸들러가 반환될 때 닫히므로, 응답 스트리밍 중에 읽을 사본을 만들고 generate()에서 직접 닫음
+    spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    await file.seek(0)
+    await asyncio.to_thread(shutil.copyfileobj, file.file, spooled)
+    spooled.seek(0)
+    upload_file = UploadFile(spooled, size=file.size, filename=file.filename, headers=file.headers)
+
+    total = upload_file.size
+    events: asyncio.Queue = asyncio.Queue()
+    uploaded_urls: List[str] = []
+
+    async def on_progress(uploaded: int) -> None:
+        await events.put({'uploaded': uploaded, 'total': total})
+
+    async def upload() -> None:
+        try:
+            image_url = await service.upload_image_to_s3(current_user.id, upload_file, on_progress=on_progress)
+            uploaded_urls.append(image_url)
+            await events.put({
+                'done': True,
+                'image_url': image_url,
+                'thumbnail_url': service.get_thumbnail_url(image_url),
+            })
+        except HTTPException as e:
+            await events.put({'error': e.detail, 'status_code': e.status_code})
+        finally:
+            await events.put(None)
+
+    async def generate():
+        task = asyncio.create_task(upload())
+        try:
+            while (event := await events.get()) is not None:
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await upload_file.close()
+
+    async def create_derivatives() -> None:
+        for image_url in uploaded_urls:
+            await dispatch_image_derivatives(current_user.id, image_url, service)
+
+    background_tasks.add_task(create_derivatives)
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.post("/upload-image/presign", response_model=PresignedUploadResponse)
+async def create_image_upload_url(
+    upload_data: ImageUploadRequest,
+    current_user: CurrentUser,
+    service: DocumentServiceDep,
+):
+    """S3 직접 업로드용 Presigned URL 발급 (업로드 후 /upload-image/complete 호출)"""
+    return await service.create_upload_url(current_user.id, upload_data)
+
+
+@router.post("/upload-image/complete", response_model=ImageUploadCompleteResponse)
+async def complete_image_upload(
+    complete_data: ImageUploadComplete,
+    current_user: CurrentUser,
+    service: DocumentServiceDep,
+    background_tasks: BackgroundTasks,
+):
+    """S3 직접 업로드 완료 확인 (document_id가 있으면 문서에 이미지 연결, 파생본은 응답 후 생성)"""
+    result = await service.complete_upload(current_user.id, complete_data)
+    background_tasks.add_task(dispatch_image_derivatives, current_user.id, result["image_url"], service)
+    return result
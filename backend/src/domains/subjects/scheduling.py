@@ -0,0 +1,99 @@
+"""
+Subject domain scheduling - 간격 반복(SM-2) 복습 스케줄링
+
+문서 하나를 채점할 때는 schedule_review / due_at 을 사용하고,
+파라미터가 바뀌어 라이브러리 전체를 다시 계산할 때는 numpy로 벡터화된
+due_at_bulk 를 사용합니다 (오프라인 작업 전용, numpy는 지연 import).
+
+interval_days 에는 SM-2 원래 간격을 저장하고, 실제 복습일은
+interval_modifier / max_interval_days 를 적용해서 계산합니다.
+그래서 두 파라미터가 바뀌면 저장된 상태만으로 복습일을 정확히 다시 계산할 수 있습니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from ...core.config import settings
+
+# 채점 기준 (0: 완전히 잊음 ~ 5: 완벽히 기억), 3 미만이면 처음부터 다시
+MIN_QUALITY = 0
+MAX_QUALITY = 5
+PASSING_QUALITY = 3
+DEFAULT_QUALITY = 4
+
+
+@dataclass(frozen=True)
+class SchedulerParams:
+    """SM-2 스케줄링 파라미터"""
+
+    min_ease: float = 1.3
+    first_interval_days: int = 1
+    second_interval_days: int = 6
+    interval_modifier: float = 1.0
+    max_interval_days: int = 365
+
+    @classmethod
+    def from_settings(cls) -> "SchedulerParams":
+        return cls(
+            interval_modifier=settings.REVIEW_INTERVAL_MODIFIER,
+            max_interval_days=settings.REVIEW_MAX_INTERVAL_DAYS,
+        )
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    """문서별 복습 상태"""
+
+    ease_factor: float = 2.5
+    repetitions: int = 0
+    interval_days: int = 0
+
+
+def schedule_review(state: ReviewState, quality: int, params: SchedulerParams) -> ReviewState:
+    """채점 결과로 다음 복습 상태 계산 (SM-2)"""
+    if not MIN_QUALITY <= quality <= MAX_QUALITY:
+        raise ValueError(f"quality는 {MIN_QUALITY}~{MAX_QUALITY} 사이여야 합니다.")
+
+    if quality >= PASSING_QUALITY:
+        if state.repetitions == 0:
+            interval = params.first_interval_days
+        elif state.repetitions == 1:
+            interval = params.second_interval_days
+        else:
+            interval = round(state.interval_days * state.ease_factor)
+        repetitions = state.repetitions + 1
+    else:
+        interval = params.first_interval_days
+        repetitions = 0
+
+    miss = MAX_QUALITY - quality
+    ease = max(params.min_ease, state.ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+
+    return ReviewState(ease_factor=round(ease, 4), repetitions=repetitions, interval_days=interval)
+
+
+def due_at(reviewed_at: datetime, state: ReviewState, params: SchedulerParams) -> datetime:
+    """복습 시각 + 실제 간격(modifier, 최대 간격 적용) = 다음 복습 시각"""
+    interval = min(params.max_interval_days, max(1, round(state.interval_days * params.interval_modifier)))
+    return reviewed_at + timedelta(days=interval)
+
+
+def due_at_bulk(reviewed_at, interval_days, params: SchedulerParams):
+    """due_at의 벡터화 버전 - ISO 문자열 배열(복습 시각)을 받아 다음 복습 시각 ISO 문자열 배열 반환
+
+    형식은 datetime.isoformat()과 같습니다 (마이크로초가 0이면 생략).
+    """
+    import numpy as np
+
+    reviewed_at = np.asarray(reviewed_at, dtype='datetime64[us]')
+    interval = np.clip(
+        np.rint(np.asarray(interval_days, dtype=np.float64) * params.interval_modifier),
+        1, params.max_interval_days,
+    ).astype('timedelta64[D]')
+
+    due = reviewed_at + interval
+    whole_seconds = due.astype('datetime64[s]') == due
+    return np.where(
+        whole_seconds,
+        np.datetime_as_string(due, unit='s'),
+        np.datetime_as_string(due, unit='us'),
+    )
@@ -2,7 +2,7 @@
 Subject domain schemas - 과목 및 문서 Pydantic 모델
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -88,6 +88,87 @@ class DocumentResponse(DocumentBase):
         from_attributes = True
 
 
+class DocumentSummaryResponse(BaseModel):
+    """문서 요약 응답 스키마 - 목록 화면용 (본문은 상세 조회에서만 제공)"""
+    document_id: str
+    subject_id: str
+    user_id: str
+    title: str
+    pages: int = 1
+    thumbnail_url: Optional[str] = None
+    review_count: int = 0
+    review_completed: bool = False
+    last_reviewed_at: Optional[str] = None
+    next_review_at: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentPage(BaseModel):
+    """문서 목록 페이지 응답 스키마"""
+    items: list[DocumentSummaryResponse] = []
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+# Image Upload Schemas
+
+class ImageUploadRequest(BaseModel):
+    """Presigned 업로드 URL 요청 스키마"""
+    filename: Optional[str] = Field(None, max_length=255, description="원본 파일명 (확장자 추출용)")
+    content_type: str = Field(..., pattern=r'^image/[\w.+-]+$', description="이미지 MIME 타입")
+    size: Optional[int] = Field(None, ge=1, description="파일 크기 (PUT 방식에서는 필수)")
+    method: Literal['POST', 'PUT'] = Field('POST', description="업로드 방식 (POST 권장: S3가 크기 제한을 검사)")
+
+
+class PresignedUploadResponse(BaseModel):
+    """Presigned 업로드 URL 응답 스키마"""
+    method: Literal['POST', 'PUT']
+    upload_url: str
+    fields: dict[str, str] = Field(default_factory=dict, description="POST 폼에 파일보다 먼저 넣어야 하는 필드")
+    headers: dict[str, str] = Field(default_factory=dict, description="PUT 요청에 포함해야 하는 헤더")
+    key: str
+    image_url: str = Field(..., description="임시 업로드 위치 - 완료 후에는 /upload-image/complete 응답의 image_url 사용")
+    expires_in: int
+
+
+class ImageUploadComplete(BaseModel):
+    """업로드 완료 알림 스키마"""
+    key: str = Field(..., description="presign 응답의 key")
+    document_id: Optional[str] = Field(None, description="이미지를 연결할 문서 ID (선택)")
+
+
+class ImageUploadCompleteResponse(BaseModel):
+    """업로드 완료 응답 스키마"""
+    key: str
+    image_url: str
+    thumbnail_url: Optional[str] = None
+    size: int
+    content_type: str
+    document: Optional[DocumentResponse] = None
+
+
+class JobResponse(BaseModel):
+    """백그라운드 작업 등록 응답 스키마"""
+    job_id: str
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    """백그라운드 작업 상태 응답 스키마"""
+    job_id: str
+    function: str
+    status: str = Field(..., description="deferred, queued, in_progress, complete, not_found")
+    attempts: int = 0
+    enqueued_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    success: Optional[bool] = None
+    error: Optional[str] = None
+    error_status_code: Optional[int] = None
+
+
 class SubjectWithDocuments(SubjectResponse):
     """과목 + 문서 리스트 응답 스키마"""
     documents: list[DocumentResponse] = []
@@ -0,0 +1,123 @@
+"""
+Import budget - 콜드 스타트 import 시간 측정
+
+`python -X importtime`으로 Lambda 진입점을 새 프로세스에서 import하고
+모듈별/패키지별 비용을 출력합니다. 전체 시간이 예산(IMPORT_BUDGET_MS)을 넘으면 종료 코드 1.
+
+    python -m src.import_budget                         # src.lambda_handler, 예산 IMPORT_BUDGET_MS
+    python -m src.import_budget --budget-ms 1000 --top 30
+    python -m src.import_budget --module src.worker --runs 5
+"""
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from src.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str) -> List[ImportRecord]:
+    """새 인터프리터에서 module을 import하고 -X importtime 결과를 파싱"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise SystemExit(f"{module} import 실패:\n" + "\n".join(tail[-20:]))
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            records.append(ImportRecord(
+                module=match.group(4),
+                self_us=int(match.group(1)),
+                cumulative_us=int(match.group(2)),
+                depth=len(match.group(3)) // 2,
+            ))
+    return records
+
+
+def total_ms(records: List[ImportRecord], module: str) -> float:
+    """대상 모듈의 누적 import 시간 (ms)"""
+    for record in records:
+        if record.module == module:
+            return record.cumulative_us / 1000
+    return 0.0
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    """최상위 패키지별 self 시간 합계 (us); src는 src.<하위 패키지>까지 구분"""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        parts = record.module.split('.')
+        key = '.'.join(parts[:3]) if parts[0] == 'src' else parts[0]
+        totals[key] += record.self_us
+    return totals
+
+
+def report(records: List[ImportRecord], module: str, top: int) -> None:
+    print(f"\n[패키지별 self 시간 상위 {top}]")
+    for name, us in sorted(by_package(records).items(), key=lambda item: -item[1])[:top]:
+        print(f"  {us / 1000:9.1f} ms  {name}")
+
+    print(f"\n[모듈별 누적 시간 상위 {top}] (src 모듈과 src가 직접 import한 모듈)")
+    parents: List[str] = []
+    rows = []
+    for record in reversed(records):  # importtime은 자식 -> 부모 순으로 출력
+        parents[record.depth:] = [record.module]
+        direct_from_src = record.depth > 0 and parents[record.depth - 1].startswith('src')
+        if record.module.startswith('src') or direct_from_src:
+            rows.append(record)
+    seen = set()
+    for record in sorted(rows, key=lambda r: -r.cumulative_us):
+        if record.module in seen:
+            continue
+        seen.add(record.module)
+        if len(seen) > top:
+            break
+        print(f"  {record.cumulative_us / 1000:9.1f} ms  {record.module}")
+
+    print(f"\n총 {total_ms(records, module):.1f} ms ({module}, 모듈 {len(records)}개)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="콜드 스타트 import 시간 측정 및 예산 검사")
+    parser.add_argument('--module', default='src.lambda_handler', help="측정할 진입점 모듈")
+    parser.add_argument('--budget-ms', type=float, default=settings.IMPORT_BUDGET_MS, help="허용 import 시간 (ms)")
+    parser.add_argument('--runs', type=int, default=3, help="측정 횟수 (가장 빠른 실행 기준)")
+    parser.add_argument('--top', type=int, default=20, help="출력할 항목 수")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda records: total_ms(records, args.module))
+    report(best, args.module, args.top)
+
+    elapsed = total_ms(best, args.module)
+    if elapsed > args.budget_ms:
+        print(f"예산 초과: {elapsed:.1f} ms > {args.budget_ms:.0f} ms")
+        return 1
+    print(f"예산 이내: {elapsed:.1f} ms <= {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
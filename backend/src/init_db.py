@@ -4,7 +4,7 @@ Initialize database - Create tables
 import asyncio
 
 from src.core.database import Base, engine, init_db
-from src.domains.ai.models import AITutorConversation
+from src.domains.ai.models import AITutorConversation, AITutorSummary
 
 
 async def create_tables():
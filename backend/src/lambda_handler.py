@@ -4,6 +4,19 @@ AWS Lambda handler using Mangum
 from mangum import Mangum
 
 from .main import app
+from .warmup import handle_warmup_event, is_warmup_event, run_warmup, should_warm_on_init
+
+# ASGI adapter
+asgi_handler = Mangum(app, lifespan="off")
+
+# 프로비저닝된 동시성/SnapStart 초기화 중에 미리 예열 (이때 초기화 시간은 사용자 지연에 포함되지 않음)
+if should_warm_on_init():
+    run_warmup('init')
+
 
 # Lambda handler
-handler = Mangum(app, lifespan="off")
+def handler(event, context):
+    """Lambda 진입점 - 예열 이벤트는 ASGI 미들웨어 스택을 거치지 않고 바로 응답"""
+    if is_warmup_event(event):
+        return handle_warmup_event()
+    return asgi_handler(event, context)
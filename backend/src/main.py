@@ -1,18 +1,13 @@
 """
 FastAPI main application - 오늘 한 장 학습 플랫폼
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .core.config import settings
-from .domains.auth.router import router as auth_router
-from .domains.users.router import router as users_router
-from .domains.learning.router import router as learning_router
-from .domains.todo.router import router as todo_router
-from .domains.calendar.router import router as calendar_router
-from .domains.statistics.router import router as statistics_router
-from .domains.ai.router import router as ai_router
-from .domains.subjects.router import router as subjects_router
+from .core.lazy_routers import LazyRouterMiddleware, LazyRouters
+from .core.llm_limiter import LLMBusyError, llm_limiter
 
 # Create FastAPI app
 app = FastAPI(
@@ -42,15 +37,44 @@ async def health_check():
     return {"status": "healthy", "version": settings.VERSION, "app": "오늘 한 장"}
 
 
-# Include routers
-app.include_router(auth_router, prefix="/api/v1/auth", tags=["인증"])
-app.include_router(users_router, prefix="/api/v1/users", tags=["사용자"])
-app.include_router(subjects_router, prefix="/api/v1/subjects", tags=["과목/문서"])
-app.include_router(learning_router, prefix="/api/v1/learning", tags=["학습/백지복습"])
-app.include_router(todo_router, prefix="/api/v1/tasks", tags=["오늘의 할 일"])
-app.include_router(calendar_router, prefix="/api/v1/calendar", tags=["캘린더/D-Day"])
-app.include_router(statistics_router, prefix="/api/v1/statistics", tags=["학습 통계"])
-app.include_router(ai_router, prefix="/api/v1/ai", tags=["AI 기능"])
+@app.get("/health/llm")
+async def llm_health_check():
+    """Outbound LLM limiter state and queue wait times per model"""
+    return {"limiters": llm_limiter.metrics()}
+
+
+@app.get("/health/cognito")
+async def cognito_health_check():
+    """Cognito call counts and latency per operation"""
+    from .domains.auth.cognito import cognito_gateway
+
+    return {"operations": cognito_gateway.metrics()}
+
+
+@app.exception_handler(LLMBusyError)
+async def llm_busy_handler(request: Request, exc: LLMBusyError):
+    """LLM 호출 대기 시간 초과 -> 503 (잠시 후 재시도)"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "AI 요청이 많아 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": str(max(1, round(settings.LLM_BACKOFF_BASE_SECONDS)))},
+    )
+
+
+# Include routers (각 도메인 라우터는 해당 경로로 첫 요청이 올 때 import 및 등록)
+lazy_routers = LazyRouters(app, package=__package__)
+lazy_routers.add("/api/v1/auth", ".domains.auth.router", tags=["인증"])
+lazy_routers.add("/api/v1/users", ".domains.users.router", tags=["사용자"])
+lazy_routers.add("/api/v1/subjects", ".domains.subjects.router", tags=["과목/문서"])
+lazy_routers.add("/api/v1/learning", ".domains.learning.router", tags=["학습/백지복습"])
+lazy_routers.add("/api/v1/tasks", ".domains.todo.router", tags=["오늘의 할 일"])
+lazy_routers.add("/api/v1/calendar", ".domains.calendar.router", tags=["캘린더/D-Day"])
+lazy_routers.add("/api/v1/statistics", ".domains.statistics.router", tags=["학습 통계"])
+lazy_routers.add("/api/v1/ai", ".domains.ai.router", tags=["AI 기능"])
+app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
+
+if not settings.LAZY_ROUTERS:
+    lazy_routers.load_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Reconcile subject statistics - 과목 통계 카운터(total_documents, total_pages) 보정
+
+문서 쓰기는 과목 카운터를 원자적 ADD로 증감하므로 평소에는 재계산이 필요 없지만,
+수동 데이터 수정이나 과거 데이터로 인한 드리프트를 바로잡을 때 실행합니다.
+
+    python -m src.reconcile_subject_stats              # 전체 과목 보정
+    python -m src.reconcile_subject_stats --dry-run    # 변경 없이 드리프트만 출력
+    python -m src.reconcile_subject_stats --user-id <user_id>
+"""
+import argparse
+
+from src.domains.subjects.repository import DocumentRepository, SubjectRepository
+
+
+def reconcile(user_id: str | None = None, dry_run: bool = False) -> int:
+    """드리프트가 있는 과목 수 반환"""
+    subject_repo = SubjectRepository()
+    doc_repo = DocumentRepository()
+
+    subjects = subject_repo.get_by_user(user_id) if user_id else subject_repo.scan_all()
+    drifted = 0
+
+    for subject in subjects:
+        total_documents, total_pages = doc_repo.get_statistics_by_subject(subject.subject_id)
+        if (subject.total_documents, subject.total_pages) == (total_documents, total_pages):
+            continue
+
+        drifted += 1
+        print(
+            f"[{subject.user_id}] {subject.name} ({subject.subject_id}): "
+            f"documents {subject.total_documents} -> {total_documents}, "
+            f"pages {subject.total_pages} -> {total_pages}"
+        )
+        if dry_run:
+            continue
+
+        updated = subject_repo.set_statistics(
+            subject.user_id, subject.subject_id,
+            total_documents, total_pages,
+            expected_documents=subject.total_documents,
+            expected_pages=subject.total_pages,
+        )
+        if not updated:
+            print("  ⚠️ 보정 중 다른 쓰기가 발생하여 건너뜀 (다시 실행하세요)")
+
+    return drifted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="과목 통계 카운터 보정")
+    parser.add_argument("--user-id", help="특정 사용자의 과목만 보정")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 드리프트만 출력")
+    args = parser.parse_args()
+
+    count = reconcile(user_id=args.user_id, dry_run=args.dry_run)
+    print(f"✅ 완료: 드리프트 과목 {count}개{' (dry-run)' if args.dry_run else ''}")
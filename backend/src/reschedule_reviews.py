@@ -0,0 +1,122 @@
+"""
+Reschedule reviews - 복습 파라미터 변경 후 전체 문서의 다음 복습일 재계산
+
+REVIEW_INTERVAL_MODIFIER / REVIEW_MAX_INTERVAL_DAYS 를 바꾼 뒤 실행합니다.
+테이블을 병렬 스캔해서 복습 상태를 배열로 모으고, numpy로 한 번에 계산한 뒤
+바뀐 문서만 다시 씁니다. 벡터화는 계산 단계뿐이고, 쓰기는 조건부 갱신
+(스캔 이후 다시 복습된 문서는 건너뜀)이라 BatchWriteItem을 쓸 수 없어
+문서별 update_item을 스레드 풀에서 병렬로 실행합니다.
+
+    python -m src.reschedule_reviews --interval-modifier 1.2 --dry-run
+    python -m src.reschedule_reviews --max-interval-days 180 --segments 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from src.domains.subjects.repository import DocumentRepository
+from src.domains.subjects.scheduling import SchedulerParams, due_at_bulk
+
+
+def scan_segment(repo: DocumentRepository, segment: int, total_segments: int) -> list[dict]:
+    """병렬 스캔 한 구간 - SM-2로 스케줄된 문서의 키와 복습 상태만 조회"""
+    table = repo.table  # 이 스레드 전용 테이블 객체 (boto3 리소스는 스레드 간 공유 불가)
+    scan_kwargs = {
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'FilterExpression': (
+            Attr('entity_type').eq('DOCUMENT')
+            & Attr('review_completed').eq(True)
+            & Attr('last_reviewed_at').exists()
+            & Attr('interval_days').gt(0)
+        ),
+        'ProjectionExpression': 'PK, SK, last_reviewed_at, interval_days, next_review_at',
+    }
+    items = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        items.extend(response.get('Items', []))
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return items
+        scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+
+def write_next_review_at(repo: DocumentRepository, item: dict, next_review_at: str) -> bool:
+    """다음 복습일 갱신 - 스캔 이후 다시 복습된 문서는 건너뜀"""
+    try:
+        repo.table.update_item(
+            Key={'PK': item['PK'], 'SK': item['SK']},
+            UpdateExpression='SET next_review_at = :next',
+            ConditionExpression='last_reviewed_at = :reviewed',
+            ExpressionAttributeValues={':next': next_review_at, ':reviewed': item['last_reviewed_at']},
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+
+def reschedule(params: SchedulerParams, segments: int = 8, workers: int = 32, dry_run: bool = False) -> int:
+    """다음 복습일이 바뀐 문서 수 반환"""
+    import numpy as np
+
+    repo = DocumentRepository()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        items = [
+            item
+            for segment_items in executor.map(lambda s: scan_segment(repo, s, segments), range(segments))
+            for item in segment_items
+        ]
+    print(f"스캔: 문서 {len(items)}개 ({time.perf_counter() - started:.1f}s)")
+
+    if not items:
+        return 0
+
+    started = time.perf_counter()
+    next_review_at = due_at_bulk(
+        [item['last_reviewed_at'] for item in items],
+        [int(item['interval_days']) for item in items],
+        params,
+    )
+    # 문자열이 아닌 시각으로 비교 (저장 형식 차이로 바뀌지 않은 문서를 다시 쓰지 않도록, 값이 없으면 NaT)
+    current = np.array([item.get('next_review_at') or 'NaT' for item in items], dtype='datetime64[us]')
+    changed = np.flatnonzero(next_review_at.astype('datetime64[us]') != current)
+    print(f"계산: 변경 대상 {len(changed)}개 ({time.perf_counter() - started:.3f}s)")
+
+    if dry_run:
+        return len(changed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = sum(executor.map(
+            lambda i: write_next_review_at(repo, items[i], str(next_review_at[i])),
+            changed,
+        ))
+    print(f"쓰기: {written}개 ({time.perf_counter() - started:.1f}s)")
+    return written
+
+
+if __name__ == "__main__":
+    defaults = SchedulerParams.from_settings()
+
+    parser = argparse.ArgumentParser(description="전체 문서의 다음 복습일 재계산")
+    parser.add_argument("--interval-modifier", type=float, default=defaults.interval_modifier)
+    parser.add_argument("--max-interval-days", type=int, default=defaults.max_interval_days)
+    parser.add_argument("--segments", type=int, default=8, help="병렬 스캔 구간 수")
+    parser.add_argument("--workers", type=int, default=32, help="동시 쓰기 스레드 수")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 대상 문서 수만 출력")
+    args = parser.parse_args()
+
+    params = SchedulerParams(
+        interval_modifier=args.interval_modifier,
+        max_interval_days=args.max_interval_days,
+    )
+    count = reschedule(params, segments=args.segments, workers=args.workers, dry_run=args.dry_run)
+    print(f"✅ 완료: 문서 {count}개{' (dry-run)' if args.dry_run else ''}")
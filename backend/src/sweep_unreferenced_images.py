@@ -0,0 +1,52 @@
+"""
+Sweep unreferenced images - 참조하는 문서가 없는 업로드 이미지 정리
+
+업로드된 이미지는 참조 수 0으로 등록되고 문서가 만들어질 때 참조 수가 올라갑니다.
+업로드만 하고 문서를 만들지 않았거나, 과목 삭제가 중간에 실패한 뒤 다시 실행되어
+이미지 삭제 대상에서 빠진 경우 참조 수 0인 등록과 S3 객체가 남으므로 주기적으로 실행합니다.
+업로드 직후 아직 문서가 만들어지지 않은 이미지는 --min-age-hours로 보호합니다.
+
+    python -m src.sweep_unreferenced_images                     # 24시간 이상 지난 미참조 이미지 삭제
+    python -m src.sweep_unreferenced_images --dry-run           # 대상 이미지 수만 출력
+    python -m src.sweep_unreferenced_images --min-age-hours 72
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from src.domains.subjects.repository import ImageRepository
+from src.domains.subjects.service import SubjectService
+
+# 업로드 후 문서 생성까지 기다려 주는 기본 시간
+DEFAULT_MIN_AGE_HOURS = 24
+
+
+def sweep(min_age_hours: float = DEFAULT_MIN_AGE_HOURS, dry_run: bool = False) -> int:
+    """삭제한 (dry-run이면 삭제할) 이미지 수 반환"""
+    image_repo = ImageRepository()
+    cutoff = (datetime.utcnow() - timedelta(hours=min_age_hours)).isoformat()
+
+    images = image_repo.scan_unreferenced(cutoff)
+    if dry_run:
+        for image in images:
+            print(f"[{image.user_id}] {image.image_key} ({image.created_at})")
+        return len(images)
+
+    # 스캔 이후 문서가 이 이미지를 참조했으면 조건부 삭제가 실패하므로 S3 객체도 유지
+    deleted_keys = []
+    for image in images:
+        if image_repo.delete_if_stale(image.user_id, image.content_hash, cutoff):
+            deleted_keys.append(image.image_key)
+
+    asyncio.run(SubjectService().delete_image_objects(deleted_keys))
+    return len(deleted_keys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="참조하는 문서가 없는 업로드 이미지 정리")
+    parser.add_argument("--min-age-hours", type=float, default=DEFAULT_MIN_AGE_HOURS, help="이보다 최근에 등록된 이미지는 유지")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 대상 이미지만 출력")
+    args = parser.parse_args()
+
+    count = sweep(min_age_hours=args.min_age_hours, dry_run=args.dry_run)
+    print(f"✅ 완료: 이미지 {count}개{' (dry-run)' if args.dry_run else ''}")
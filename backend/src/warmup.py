@@ -0,0 +1,155 @@
+"""
+Warmup - 스케일 아웃 직후 첫 요청 지연을 줄이기 위한 예열
+
+Lambda 초기화(프로비저닝된 동시성/SnapStart, 또는 WARMUP_ON_INIT=true) 중이나
+예약 예열 이벤트({"warmup": true}, EventBridge 예약 이벤트, serverless-plugin-warmup)를 받으면
+아래 단계를 순서대로 실행하고 단계별 소요 시간을 기록합니다.
+
+    routers   - 모든 도메인 라우터 import 및 등록 (FastAPI 라우트/응답 모델 생성 포함)
+    schemas   - 아직 완성되지 않은 Pydantic 스키마 재빌드
+    aws       - S3/Bedrock/Cognito 클라이언트, DynamoDB 리소스와 테이블 생성
+    jwks      - Cognito JWKS 미리 조회
+    database  - SQLAlchemy 커넥션 풀 열기 (sqlite는 건너뜀)
+
+각 단계의 실패는 기록만 하고 다음 단계로 넘어갑니다 (예열 실패가 요청 처리를 막지 않도록).
+"""
+import asyncio
+import inspect
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .core.config import settings
+
+# 예열 대상 초기화 유형 (AWS_LAMBDA_INITIALIZATION_TYPE)
+_PREWARMED_INIT_TYPES = {'provisioned-concurrency', 'snap-start'}
+
+# 마지막 예열 결과 (컨테이너당 한 번만 전체 예열)
+_last_report: Optional[Dict[str, Any]] = None
+
+
+def _load_routers() -> str:
+    from .main import lazy_routers
+
+    lazy_routers.load_all()
+    return f"{len(lazy_routers.load_times)} routers"
+
+
+def _rebuild_schemas() -> str:
+    from pydantic import BaseModel
+
+    prefix = f"{__package__}.domains."
+    rebuilt = checked = 0
+    for name, module in list(sys.modules.items()):
+        if not (name.startswith(prefix) and name.endswith('.schemas')):
+            continue
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, BaseModel) and value.__module__ == name:
+                checked += 1
+                if not value.__pydantic_complete__:
+                    value.model_rebuild()
+                    rebuilt += 1
+    return f"{checked} models, {rebuilt} rebuilt"
+
+
+def _create_aws_clients() -> str:
+    from .core.aws import get_bedrock_client, get_cognito_client, get_s3_client
+    from .core.dynamodb import dynamodb_provider
+    from .domains.subjects.repository import DOCUMENTS_TABLE, SUBJECTS_TABLE
+
+    get_s3_client()
+    get_bedrock_client()
+    get_cognito_client()
+    dynamodb_provider.table(SUBJECTS_TABLE)
+    dynamodb_provider.table(DOCUMENTS_TABLE)
+    return "s3, bedrock-runtime, cognito-idp, dynamodb"
+
+
+async def _prefetch_jwks() -> str:
+    from .dependencies import cognito_jwks
+
+    await cognito_jwks.refresh()
+    if not cognito_jwks.kids:
+        raise RuntimeError("no keys fetched")
+    return f"{len(cognito_jwks.kids)} keys"
+
+
+async def _open_database() -> str:
+    from .core.database import engine
+
+    # 기본값 sqlite(./test.db)는 로컬 개발용이고, Lambda에서는 읽기 전용 /var/task에 만들 수 없음
+    if engine.url.get_backend_name() == 'sqlite':
+        return "skipped (sqlite)"
+    async with engine.connect():
+        pass
+    return engine.url.drivername
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], Any]]] = [
+    ('routers', _load_routers),
+    ('schemas', _rebuild_schemas),
+    ('aws', _create_aws_clients),
+    ('jwks', _prefetch_jwks),
+    ('database', _open_database),
+]
+
+
+async def warmup(trigger: str) -> Dict[str, Any]:
+    """예열 단계 실행 후 단계별 결과와 소요 시간(ms) 반환"""
+    global _last_report
+
+    start = time.perf_counter()
+    steps: Dict[str, Dict[str, Any]] = {}
+    for name, step in WARMUP_STEPS:
+        step_start = time.perf_counter()
+        try:
+            result = step()
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, settings.WARMUP_STEP_TIMEOUT)
+            steps[name] = {"ok": True, "detail": result}
+        except Exception as e:
+            steps[name] = {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+        steps[name]["ms"] = round((time.perf_counter() - step_start) * 1000, 1)
+
+    report = {
+        "trigger": trigger,
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "steps": steps,
+    }
+    print(
+        f"Warmup ({trigger}) {report['total_ms']}ms: "
+        + ", ".join(
+            f"{name}={step['ms']}ms" + ("" if step["ok"] else f" FAILED ({step['error']})")
+            for name, step in steps.items()
+        )
+    )
+    _last_report = report
+    return report
+
+
+def run_warmup(trigger: str) -> Dict[str, Any]:
+    """동기 진입점 - Mangum과 같은 이벤트 루프에서 실행 (열어둔 DB 커넥션을 그대로 재사용)"""
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(warmup(trigger))
+
+
+def should_warm_on_init() -> bool:
+    """초기화 중 예열 여부 (초기화 시간이 사용자 요청 지연에 포함되지 않는 경우만 기본 활성화)"""
+    return settings.WARMUP_ON_INIT or os.getenv('AWS_LAMBDA_INITIALIZATION_TYPE') in _PREWARMED_INIT_TYPES
+
+
+def is_warmup_event(event: Any) -> bool:
+    """예열 이벤트 여부 (직접 호출, EventBridge 예약 이벤트, serverless-plugin-warmup)"""
+    if not isinstance(event, dict):
+        return False
+    if event.get('warmup') is True or event.get('source') == 'serverless-plugin-warmup':
+        return True
+    return event.get('source') == 'aws.events' and event.get('detail-type') == 'Scheduled Event'
+
+
+def handle_warmup_event() -> Dict[str, Any]:
+    """예열 이벤트 응답 - 이미 예열된 컨테이너는 바로 반환"""
+    if _last_report is not None:
+        return {"warmup": True, "already_warm": True, "last": _last_report}
+    return {"warmup": True, "already_warm": False, "last": run_warmup('event')}
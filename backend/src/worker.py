@@ -1,10 +1,18 @@
 """
 ARQ worker for background tasks (optional)
+
+Run with: arq src.worker.WorkerSettings (REDIS_URL must point at the same Redis as the API)
 """
 from arq import create_pool
-from arq.connections import RedisSettings
 
 from .core.config import settings
+from .domains.subjects.jobs import (
+    correct_text_job,
+    delete_subject_job,
+    generate_note_job,
+    image_derivatives_job,
+    redis_settings as job_redis_settings,
+)
 
 
 async def sample_task(ctx):
@@ -16,5 +24,8 @@ async def sample_task(ctx):
 class WorkerSettings:
     """ARQ worker settings"""
 
-    functions = [sample_task]
-    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
+    functions = [sample_task, correct_text_job, generate_note_job, image_derivatives_job, delete_subject_job]
+    redis_settings = job_redis_settings()
+    max_tries = settings.JOB_MAX_TRIES
+    job_timeout = settings.JOB_TIMEOUT_SECONDS
+    keep_result = settings.JOB_RESULT_TTL_SECONDS
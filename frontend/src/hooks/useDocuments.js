@@ -22,19 +22,22 @@ export const useDocuments = (subjectId, selectedDate = null) => {
   const [documents, setDocuments] = useState([]);
   const [filteredDocuments, setFilteredDocuments] = useState([]);
   const [isLoading, setIsLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [isUpdating, setIsUpdating] = useState(false);
   const [deletingId, setDeletingId] = useState(null);
 
-  // 문서 목록 불러오기
+  // 문서 목록 불러오기 (첫 페이지)
   const loadDocuments = useCallback(async () => {
     if (!subjectId) return;
 
     try {
       setIsLoading(true);
       setError(null);
-      const docs = await getSubjectDocuments(subjectId);
-      setDocuments(docs);
+      const page = await getSubjectDocuments(subjectId);
+      setDocuments(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       console.error('문서 목록 불러오기 실패:', err);
       setError('문서 목록을 불러오는데 실패했습니다.');
@@ -43,6 +46,24 @@ export const useDocuments = (subjectId, selectedDate = null) => {
     }
   }, [subjectId]);
 
+  // 다음 페이지 이어서 불러오기 (더 보기)
+  const loadMoreDocuments = useCallback(async () => {
+    if (!subjectId || !nextCursor || isLoadingMore) return;
+
+    try {
+      setIsLoadingMore(true);
+      setError(null);
+      const page = await getSubjectDocuments(subjectId, nextCursor);
+      setDocuments(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('문서 목록 더 불러오기 실패:', err);
+      setError('문서 목록을 불러오는데 실패했습니다.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [subjectId, nextCursor, isLoadingMore]);
+
   // 문서 필터링 (날짜별)
   useEffect(() => {
     if (!selectedDate) {
@@ -116,12 +137,15 @@ export const useDocuments = (subjectId, selectedDate = null) => {
     documents,
     filteredDocuments,
     isLoading,
+    isLoadingMore,
+    hasMore: Boolean(nextCursor),
     error,
     isUpdating,
     deletingId,
 
     // 액션
     loadDocuments,
+    loadMoreDocuments,
     createDocument: handleCreateDocument,
     updateDocument: handleUpdateDocument,
     deleteDocument: handleDeleteDocument,
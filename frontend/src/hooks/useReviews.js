@@ -4,19 +4,21 @@
  */
 
 import { useState, useCallback } from 'react';
-import { getReviewDocuments } from '../services/subjectsApi';
+import { getReviewDocuments, mergeReviewPages } from '../services/subjectsApi';
 
 export const useReviews = () => {
   const [reviewData, setReviewData] = useState({
     today: [],
     overdue: [],
     today_count: 0,
-    overdue_count: 0
+    overdue_count: 0,
+    next_cursor: null
   });
   const [isLoading, setIsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
-  // 복습 데이터 불러오기
+  // 복습 데이터 불러오기 (첫 페이지)
   const loadReviews = useCallback(async () => {
     try {
       setIsLoading(true);
@@ -30,7 +32,8 @@ export const useReviews = () => {
         today: [],
         overdue: [],
         today_count: 0,
-        overdue_count: 0
+        overdue_count: 0,
+        next_cursor: null
       });
       setError(null); // 에러 메시지 표시하지 않음
     } finally {
@@ -38,6 +41,21 @@ export const useReviews = () => {
     }
   }, []);
 
+  // 다음 페이지 이어서 불러오기 (더 보기)
+  const loadMoreReviews = useCallback(async () => {
+    if (!reviewData.next_cursor || isLoadingMore) return;
+
+    try {
+      setIsLoadingMore(true);
+      const page = await getReviewDocuments(reviewData.next_cursor);
+      setReviewData(prev => mergeReviewPages(prev, page));
+    } catch (err) {
+      console.error('복습 데이터 더 불러오기 실패:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [reviewData.next_cursor, isLoadingMore]);
+
   // 복습 항목 체크박스 토글
   const handleToggleReview = useCallback((documentId) => {
     console.log("Toggle review:", documentId);
@@ -56,10 +74,13 @@ export const useReviews = () => {
     // 상태
     reviewData,
     isLoading,
+    isLoadingMore,
+    hasMore: Boolean(reviewData.next_cursor),
     error,
 
     // 액션
     loadReviews,
+    loadMoreReviews,
     toggleReview: handleToggleReview,
 
     // 헬퍼
@@ -16,6 +16,7 @@ import { SubjectsList } from '../../components/domain/subjects/SubjectsList';
 import { SubjectModal } from '../../components/domain/subjects/SubjectModal';
 import { useSubjects } from '../../hooks/useSubjects';
 import { useReviews } from '../../hooks/useReviews';
+import { Button } from '../../components/common/Button';
 
 export const ReviewPage = ({ autoSelectToday = false, selectedDate, setSelectedDate }) => {
   // React Router hooks
@@ -43,8 +44,11 @@ export const ReviewPage = ({ autoSelectToday = false, selectedDate, setSelectedD
   const {
     reviewData,
     isLoading: isLoadingReviews,
+    isLoadingMore: isLoadingMoreReviews,
+    hasMore: hasMoreReviews,
     error: reviewsError,
     loadReviews,
+    loadMoreReviews,
     toggleReview,
     calculateOverdueDays
   } = useReviews();
@@ -164,6 +168,15 @@ export const ReviewPage = ({ autoSelectToday = false, selectedDate, setSelectedD
           calculateOverdueDays={calculateOverdueDays}
         />
 
+        {/* 다음 페이지 (오늘의 복습, 밀린 복습 함께) */}
+        {!isLoadingReviews && hasMoreReviews && (
+          <div className="flex justify-center mb-12">
+            <Button variant="secondary" onClick={loadMoreReviews} disabled={isLoadingMoreReviews}>
+              {isLoadingMoreReviews ? '불러오는 중...' : '복습 더 보기'}
+            </Button>
+          </div>
+        )}
+
         {/* My Subjects Section */}
         <SubjectsList
           subjects={subjects}
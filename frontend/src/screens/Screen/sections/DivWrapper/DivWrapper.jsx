@@ -127,8 +127,9 @@ export const DivWrapper = () => {
     fetchReviewData();
   }, []);
 
-  // 총 복습 개수
+  // 총 복습 개수 (대시보드는 첫 페이지만 불러오므로 다음 페이지가 있으면 "+" 표시)
   const totalReviews = reviewData.today_count + reviewData.overdue_count;
+  const moreMark = reviewData.next_cursor ? '+' : '';
 
   // 유틸리티 함수들
   const formatCurrentDate = () => {
@@ -236,12 +237,12 @@ export const DivWrapper = () => {
               </div>
 
               <div className="absolute top-[78px] left-8 [font-family:'Pretendard-SemiBold',Helvetica] font-semibold text-[#111111] text-2xl tracking-[-0.60px] leading-[33.6px] whitespace-nowrap">
-                {`${reviewData.today_count}개 할 일`}
+                {`${reviewData.today_count}${moreMark}개 할 일`}
               </div>
 
               <div className="absolute top-[116px] left-8 [font-family:'Pretendard-Regular',Helvetica] font-normal text-[#767676] text-base tracking-[-0.40px] leading-[22.4px] whitespace-nowrap">
                 {reviewData.overdue_count > 0
-                  ? `${reviewData.overdue_count}개의 밀린 복습이 있어요`
+                  ? `${reviewData.overdue_count}${moreMark}개의 밀린 복습이 있어요`
                   : '밀린 복습이 없어요!'}
               </div>
             </button>
@@ -329,7 +330,7 @@ export const DivWrapper = () => {
           <div className="flex ml-[42px] w-[505px] h-[60px] relative mt-3 flex-col items-start gap-1">
             <p className="relative w-[528px] mt-[-1.00px] mr-[-23.00px] [font-family:'Pretendard-Medium',Helvetica] font-medium text-[#767676] text-xl tracking-[-0.50px] leading-[28.0px]">
               {totalReviews > 0
-                ? `오늘 ${reviewData.today_count}개, 밀린 복습 ${reviewData.overdue_count}개가 있어요! 오늘도 화이팅!`
+                ? `오늘 ${reviewData.today_count}${moreMark}개, 밀린 복습 ${reviewData.overdue_count}${moreMark}개가 있어요! 오늘도 화이팅!`
                 : `최근 7일 간 복습 지속률이 ${studyStats.reviewStreakRate}%예요! 이번주도 정말 잘 하고 있어요`}
             </p>
 
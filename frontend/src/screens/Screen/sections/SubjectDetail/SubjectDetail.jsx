@@ -11,6 +11,7 @@ import { DocumentListItem } from "../../../../components/domain/documents/Docume
 import { BottomSheet, BottomSheetOption } from "../../../../components/common/BottomSheet";
 import { OCRResultModal } from "../../../../components/domain/ocr/OCRResultModal";
 import { ListItemSkeleton } from "../../../../components/ui/Skeleton";
+import { Button } from "../../../../components/common/Button";
 
 export const SubjectDetail = ({ subjectName, subjectId, selectedDate, onBack }) => {
   const navigate = useNavigate();
@@ -19,8 +20,11 @@ export const SubjectDetail = ({ subjectName, subjectId, selectedDate, onBack })
   const {
     filteredDocuments,
     isLoading,
+    isLoadingMore,
+    hasMore,
     deletingId,
     loadDocuments,
+    loadMoreDocuments,
     createDocument,
     updateDocument: updateDocumentApi,
     deleteDocument: deleteDocumentApi,
@@ -237,6 +241,13 @@ export const SubjectDetail = ({ subjectName, subjectId, selectedDate, onBack })
               />
             ))
           )}
+
+          {/* 다음 페이지 (날짜 필터는 불러온 문서에만 적용) */}
+          {!isLoading && hasMore && (
+            <Button variant="secondary" onClick={loadMoreDocuments} disabled={isLoadingMore}>
+              {isLoadingMore ? '불러오는 중...' : '더 보기'}
+            </Button>
+          )}
         </div>
 
         {/* Floating Action Button */}
@@ -83,11 +83,19 @@ export const createDocument = async (documentData) => {
 };
 
 /**
- * 특정 과목의 문서 목록 조회
+ * 커서 기반 페이지네이션 쿼리스트링 생성
+ * @param {string|null} cursor - 이전 응답의 next_cursor
+ */
+const pageQuery = (cursor) => (cursor ? `?cursor=${encodeURIComponent(cursor)}` : '');
+
+/**
+ * 특정 과목의 문서 목록 한 페이지 조회 (다음 페이지는 next_cursor로 이어서 조회)
  * @param {string} subjectId - 과목 ID
+ * @param {string|null} cursor - 이전 응답의 next_cursor (첫 페이지면 null)
+ * @returns {Promise<{items: Array, next_cursor: string|null}>}
  */
-export const getSubjectDocuments = async (subjectId) => {
-  return apiRequest(API_ENDPOINTS.subjectDocuments(subjectId), {
+export const getSubjectDocuments = async (subjectId, cursor = null) => {
+  return apiRequest(`${API_ENDPOINTS.subjectDocuments(subjectId)}${pageQuery(cursor)}`, {
     method: 'GET',
   });
 };
@@ -127,15 +135,29 @@ export const deleteDocument = async (documentId) => {
 // ============= Reviews API =============
 
 /**
- * 복습 문서 조회 (오늘의 복습, 밀린 복습)
- * @returns {Promise<{today: Array, overdue: Array, today_count: number, overdue_count: number}>}
+ * 복습 문서 한 페이지 조회 (오늘의 복습, 밀린 복습 - 개수는 이 페이지 기준)
+ * @param {string|null} cursor - 이전 응답의 next_cursor (첫 페이지면 null)
+ * @returns {Promise<{today: Array, overdue: Array, today_count: number, overdue_count: number, next_cursor: string|null}>}
  */
-export const getReviewDocuments = async () => {
-  return apiRequest(API_ENDPOINTS.reviews, {
+export const getReviewDocuments = async (cursor = null) => {
+  return apiRequest(`${API_ENDPOINTS.reviews}${pageQuery(cursor)}`, {
     method: 'GET',
   });
 };
 
+/**
+ * 복습 페이지 이어 붙이기 (더 보기)
+ * @param {Object} current - 지금까지 불러온 복습 데이터
+ * @param {Object} page - getReviewDocuments로 받은 다음 페이지
+ */
+export const mergeReviewPages = (current, page) => ({
+  today: [...current.today, ...page.today],
+  overdue: [...current.overdue, ...page.overdue],
+  today_count: current.today_count + page.today_count,
+  overdue_count: current.overdue_count + page.overdue_count,
+  next_cursor: page.next_cursor,
+});
+
 /**
  * AI 텍스트 교정
  * @param {string} documentId - 문서 ID
@@ -153,10 +175,12 @@ export const aiTextCorrection = async (documentId, originalText) => {
 
 /**
  * 이미지를 S3에 업로드
+ * Presigned POST로 S3에 직접 업로드하고 (API 서버를 거치지 않음) 완료를 알림
  * @param {File} file - 업로드할 이미지 파일
+ * @param {string} [documentId] - 이미지를 연결할 문서 ID (선택)
  * @returns {Promise<{image_url: string}>}
  */
-export const uploadImageToS3 = async (file) => {
+export const uploadImageToS3 = async (file, documentId) => {
   // Blob인 경우 File 객체로 변환 (filename 보장)
   if (file instanceof Blob && !(file instanceof File)) {
     file = new File([file], 'compressed_image.jpg', {
@@ -164,14 +188,34 @@ export const uploadImageToS3 = async (file) => {
     });
   }
 
-  // FormData 생성
+  // 1. Presigned POST 발급
+  const presigned = await apiRequest(`${API_ENDPOINTS.subjects}/upload-image/presign`, {
+    method: 'POST',
+    body: JSON.stringify({
+      filename: file.name,
+      content_type: file.type || 'image/jpeg',
+      size: file.size,
+    }),
+  });
+
+  // 2. S3에 직접 업로드 (정책 필드를 파일보다 먼저 넣어야 함)
   const formData = new FormData();
+  Object.entries(presigned.fields).forEach(([name, value]) => {
+    formData.append(name, value);
+  });
   formData.append('file', file);
 
-  // S3 업로드 API 호출
-  return apiRequest(`${API_ENDPOINTS.subjects}/upload-image`, {
+  const uploadResponse = await fetch(presigned.upload_url, {
     method: 'POST',
     body: formData,
-    // Content-Type은 브라우저가 자동으로 multipart/form-data로 설정
+  });
+  if (!uploadResponse.ok) {
+    throw new Error(`S3 업로드 실패 (${uploadResponse.status})`);
+  }
+
+  // 3. 업로드 완료 알림 (서버에서 객체 검증, 문서 연결)
+  return apiRequest(`${API_ENDPOINTS.subjects}/upload-image/complete`, {
+    method: 'POST',
+    body: JSON.stringify({ key: presigned.key, document_id: documentId }),
   });
 };